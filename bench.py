@@ -0,0 +1,731 @@
+import argparse, json, math, os, platform, subprocess, sys, time, tracemalloc
+from trail import Trail, SplineTrail, REFERENCE_DT
+from cursor import CursorSource
+from config import Settings
+import config
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def cursor_path(ticks, w=1920, h=1080):
+    # Deterministic figure-eight sweep so every run sees the same motion
+    return [(w / 2 + w / 3 * math.sin(t * 0.05), h / 2 + h / 3 * math.sin(t * 0.1)) for t in range(ticks)]
+
+
+def percentile(samples, p):
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(len(s) * p / 100))]
+
+
+def timed(fn, args):
+    samples = []
+    for a in args:
+        t0 = time.perf_counter()
+        fn(*a)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def bench_physics(args):
+    from PyQt6.QtCore import QPointF
+    path = cursor_path(args.ticks)
+    follow, lag = 0.25, 0.20
+
+    def legacy_step(dots, mouse_x, mouse_y):
+        # The list-of-QPointF chase Overlay.update_overlay used before the array-backed Trail
+        lead = dots[0]
+        lead.setX(lead.x() + (mouse_x - lead.x()) * follow)
+        lead.setY(lead.y() + (mouse_y - lead.y()) * follow)
+        for i in range(1, len(dots)):
+            prev, curr = dots[i - 1], dots[i]
+            curr.setX(curr.x() + (prev.x() - curr.x()) * lag)
+            curr.setY(curr.y() + (prev.y() - curr.y()) * lag)
+
+    print(f"{'dots':>6} {'QPointF p50 ms':>15} {'Trail p50 ms':>13} {'Trail p99 ms':>13} {'speedup':>8}")
+    for n in args.dots:
+        dots = [QPointF(960, 540) for _ in range(n)]
+        legacy = timed(lambda x, y: legacy_step(dots, x, y), path)
+        trail = Trail(n, 960, 540)
+        fast = timed(lambda x, y: trail.step(x, y, follow, lag), path)
+        a, b = percentile(legacy, 50), percentile(fast, 50)
+        print(f"{n:>6} {a:>15.4f} {b:>13.4f} {percentile(fast, 99):>13.4f} {a / b:>7.1f}x")
+
+
+def bench_spline(args):
+    import numpy as np
+    # A fast sweep: the figure-eight at a few times the usual speed
+    path = [(960 + 640 * math.sin(t * args.speed * 0.05), 540 + 360 * math.sin(t * args.speed * 0.1)) for t in range(args.ticks)]
+    print(f"{'dots':>5} {'mode':>7} {'gap p95 px':>11} {'gap max px':>11} {'advance p50 ms':>15}")
+    for n in args.dots:
+        for name, trail in (("chase", Trail(n, *path[0])), ("spline", SplineTrail(n, *path[0]))):
+            gaps = []
+
+            def tick(x, y):
+                trail.advance(x, y, 0.25, 0.20, REFERENCE_DT)
+            ms = timed(tick, path)
+            for x, y in path[:240]:
+                trail.advance(x, y, 0.25, 0.20, REFERENCE_DT)
+                gaps.append(float(np.hypot(*np.diff(trail.view, axis=0).T).max()))
+            print(f"{n:>5} {name:>7} {percentile(gaps, 95):>11.1f} {max(gaps):>11.1f} {percentile(ms, 50):>15.4f}")
+
+
+def bench_particles(args):
+    from PyQt6.QtGui import QGuiApplication, QPainter
+    from shapes import SpriteCache
+    from particles import ParticleSystem, PRESETS
+    app = QGuiApplication.instance() or QGuiApplication([])
+    image = render_target()
+    sprites = SpriteCache()
+    path = cursor_path(args.frames + 1)
+    budget = 1000 / 60
+    print(f"{'effect':>9} {'shape':>8} {'live':>6} {'emit ms':>8} {'step ms':>8} {'paint ms':>9} {'frame p50':>10} {'p95':>7} {'p99':>7} {'60 FPS':>7}")
+    for effect in args.effects or list(PRESETS):
+        for shape in args.shapes:
+            system = ParticleSystem(effect, max(args.count, 1), seed=1)
+            sprite = sprites.get(shape, system.extent(args.max_size), (0, 255, 255))
+            system.spawn(args.count, *path[0], *path[1])
+            phases, frames, live = [[], [], []], [], []
+
+            def frame(i):
+                # Top the pool back up to --count each frame, along the emitter's move, so the load stays constant
+                t0 = time.perf_counter()
+                system.spawn(args.count - len(system), *path[i], *path[i + 1])
+                t1 = time.perf_counter()
+                system.step(REFERENCE_DT)
+                t2 = time.perf_counter()
+                live.append(len(system))
+                painter = QPainter(image)
+                system.paint(painter, sprite)
+                painter.end()
+                t3 = time.perf_counter()
+                for samples, a, b in zip(phases, (t0, t1, t2), (t1, t2, t3)):
+                    samples.append((b - a) * 1000)
+                frames.append((t3 - t0) * 1000)
+            for i in range(args.frames):
+                frame(i)
+            emit, step, paint = (percentile(p, 50) for p in phases)
+            p95 = percentile(frames, 95)
+            print(f"{effect:>9} {shape:>8} {min(live):>6} {emit:>8.3f} {step:>8.3f} {paint:>9.3f} {percentile(frames, 50):>10.3f} "
+                  f"{p95:>7.3f} {percentile(frames, 99):>7.3f} {'yes' if p95 < budget else 'NO':>7}")
+
+
+def settle(trail, ticks=120, follow=0.25, lag=0.20):
+    # Run the physics for a while so the dots are spread along a real trail
+    for x, y in cursor_path(ticks):
+        trail.step(x, y, follow, lag)
+    return trail
+
+
+def render_target(w=1920, h=1080):
+    from PyQt6.QtGui import QImage
+    from PyQt6.QtCore import Qt
+    image = QImage(w, h, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    return image
+
+
+def bench_shapes(args):
+    from PyQt6.QtGui import QGuiApplication, QPainter, QColor, QPixmap
+    from PyQt6.QtCore import Qt
+    from shapes import SHAPES, SpriteCache, draw_shape, paint_trail
+    app = QGuiApplication.instance() or QGuiApplication([])
+    pixmap = QPixmap("icon.ico")
+    trail = settle(Trail(args.dots, 960, 540))
+    image = render_target()
+
+    def legacy_paint(settings):
+        # Per-dot geometry and QColor, as Overlay.paintEvent drew before the sprite cache
+        painter = QPainter(image)
+        painter.setPen(Qt.PenStyle.NoPen)
+        r, g, b = settings.color
+        shape, max_size, n = settings.shape, settings.max_size, len(trail)
+        for i, (x, y) in enumerate(trail.pos.tolist()):
+            alpha = max(10, int(255 * (1 - i / max(n, 1))))
+            size = max(1, max_size - (i * (max_size / max(n, 1))))
+            draw_shape(painter, shape, x, y, size, QColor(r, g, b, alpha), pixmap)
+        painter.end()
+
+    def sprite_paint(settings, sprites):
+        painter = QPainter(image)
+        paint_trail(painter, sprites, trail.pos, settings, pixmap)
+        painter.end()
+
+    print(f"{'shape':>10} {'before p50 ms':>14} {'after p50 ms':>13} {'speedup':>8}")
+    for shape in SHAPES:
+        settings = Settings(shape=shape, max_size=args.max_size)
+        sprites = SpriteCache()
+        before = timed(lambda: legacy_paint(settings), [()] * args.frames)
+        after = timed(lambda: sprite_paint(settings, sprites), [()] * args.frames)
+        a, b = percentile(before, 50), percentile(after, 50)
+        print(f"{shape:>10} {a:>14.3f} {b:>13.3f} {a / b:>7.1f}x")
+
+
+def region_pixels(region, w, h):
+    import numpy as np
+    from PyQt6.QtGui import QImage, QPainter
+    from PyQt6.QtCore import Qt
+    mask = QImage(w, h, QImage.Format.Format_Grayscale8)
+    mask.fill(0)
+    painter = QPainter(mask)
+    painter.setClipRegion(region)
+    painter.fillRect(0, 0, w, h, Qt.GlobalColor.white)
+    painter.end()
+    bits = np.frombuffer(mask.constBits().asstring(mask.sizeInBytes()), np.uint8).reshape(h, mask.bytesPerLine())
+    return int(np.count_nonzero(bits[:, :w]))
+
+
+def bench_dirty(args):
+    from PyQt6.QtWidgets import QApplication
+    import overlay
+    app = QApplication.instance() or QApplication([])
+    w, h = args.width, args.height
+    repainted = []
+
+    class Probe(overlay.Overlay):
+        # Records the region Qt actually hands to the overlay's paintEvent
+        def paintEvent(self, event):
+            repainted.append(region_pixels(event.region(), w, h))
+            super().paintEvent(event)
+
+    clock = ManualClock()
+    settings = Settings(num_dots=args.dots, max_size=args.max_size, frame_budget_ms=0)
+    ov = Probe(settings, PathCursor(cursor_path(args.frames, w, h)), clock)
+    ov.timer.stop()
+    ov.setGeometry(0, 0, w, h)
+    app.processEvents()
+    repainted.clear()
+    for _ in range(args.frames):
+        clock.t += REFERENCE_DT
+        ov.update_overlay()
+        app.processEvents()
+    ov.close()
+    full = w * h
+    if not repainted:
+        print("no frames were painted")
+        sys.exit(1)
+    mean = sum(repainted) / len(repainted)
+    print(f"{len(repainted)} frames at {w}x{h}, {args.dots} dots, max_size {args.max_size}")
+    print(f"repainted px/frame: mean {mean:.0f}  p95 {percentile(repainted, 95)}  max {max(repainted)}")
+    print(f"full-screen px/frame: {full}  ({mean / full:.2%} of the screen on average)")
+    if max(repainted) >= full:
+        print("a frame repainted the whole screen; the overlay is not updating only its dirty region")
+        sys.exit(1)
+
+
+class ManualClock:
+    # Stands in for time.perf_counter so replays advance by exact frame steps
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class PathCursor(CursorSource):
+    # Feeds a precomputed list of points, one per pos() call, looping at the end
+    def __init__(self, points):
+        self.points = points
+        self.i = -1
+
+    def pos(self):
+        self.i = (self.i + 1) % len(self.points)
+        x, y = self.points[self.i]
+        return int(x), int(y)
+
+
+def bench_trace(args):
+    from cursor import TraceRecorder
+    clock = ManualClock()
+    recorder = TraceRecorder(PathCursor(cursor_path(int(args.seconds * 1000), args.width, args.height)), args.out, clock)
+    for _ in range(int(args.seconds * 1000)):
+        recorder.pos()
+        clock.t += 0.001
+    recorder.close()
+    print(f"wrote {args.seconds:g} s of synthetic movement to {args.out}")
+
+
+def bench_replay(args):
+    from PyQt6.QtWidgets import QApplication
+    from cursor import ReplayCursor
+    import overlay
+    app = QApplication.instance() or QApplication([])
+    settings = config.read(args.settings) if args.settings else Settings()
+    # Raw frame cost: with the governor on, the spikes being chased would be traded away for lower quality. Live
+    # remote pointers would make runs differ.
+    settings = settings.replace(frame_budget_ms=0, pointer_feed="")
+    clock = ManualClock()
+    cursor = ReplayCursor(args.trace, clock=clock)
+    ov = overlay.Overlay(settings, cursor, clock)
+    ov.timer.stop()
+    app.processEvents()
+    frames, areas = [], []
+    while not cursor.done:
+        clock.t += 1 / args.hz
+        t0 = time.perf_counter()
+        ov.update_overlay()
+        app.processEvents()
+        frames.append(((time.perf_counter() - t0) * 1000, clock.t))
+        areas.append(ov.width() * ov.height())
+    ov.close()
+    ms = [f for f, _ in frames]
+    print(f"{len(frames)} frames at {args.hz:g} Hz over {cursor.duration:.2f} s of trace")
+    print(f"frame ms: p50 {percentile(ms, 50):.3f}  p95 {percentile(ms, 95):.3f}  p99 {percentile(ms, 99):.3f}  max {max(ms):.3f}")
+    print(f"window ({settings.window_mode}): mean {sum(areas) / len(areas):.0f} px, ARGB backing store {sum(areas) / len(areas) * 4 / 2 ** 20:.2f} MiB")
+    for f, t in sorted(frames, reverse=True)[:args.spikes]:
+        print(f"  spike {f:.3f} ms at trace t={t:.3f} s")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_render(args):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QT_VERSION_STR
+    from shapes import SHAPES
+    import overlay
+    app = QApplication.instance() or QApplication([])
+    w, h = args.width, args.height
+    clock = ManualClock()
+    ov = overlay.Overlay(Settings(frame_budget_ms=0), PathCursor(cursor_path(600, w, h)), clock)
+    ov.timer.stop()
+    ov.setGeometry(0, 0, w, h)
+    image = render_target(w, h)
+    shapes = args.shapes or SHAPES
+
+    def frame():
+        clock.t += REFERENCE_DT
+        ov.update_overlay()
+        ov.render(image)
+
+    results = []
+    print(f"{'shape':>10} {'dots':>5} {'size':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'alloc KiB':>10}")
+    for shape in shapes:
+        for n in args.dots:
+            for max_size in args.max_size:
+                settings = Settings(shape=shape, num_dots=n, max_size=max_size, image_path="icon.ico",
+                                    color_mode=args.color_mode, size_easing=args.easing, opacity_easing=args.easing, frame_budget_ms=0)
+                ov.apply_settings(settings)
+                for _ in range(args.warmup):
+                    frame()
+                ms = timed(frame, [()] * args.frames)
+                # Allocation pass runs separately so tracemalloc's overhead stays out of the timings
+                tracemalloc.start()
+                allocs = []
+                for _ in range(args.alloc_frames):
+                    tracemalloc.reset_peak()
+                    base = tracemalloc.get_traced_memory()[0]
+                    frame()
+                    allocs.append(tracemalloc.get_traced_memory()[1] - base)
+                tracemalloc.stop()
+                row = {"shape": shape, "num_dots": n, "max_size": max_size, "frames": args.frames,
+                       "p50_ms": percentile(ms, 50), "p95_ms": percentile(ms, 95), "p99_ms": percentile(ms, 99),
+                       "alloc_bytes": percentile(allocs, 50)}
+                results.append(row)
+                print(f"{shape:>10} {n:>5} {max_size:>4} {row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['alloc_bytes'] / 1024:>10.1f}")
+    ov.close()
+    report = {"commit": git_commit(), "python": platform.python_version(), "qt": QT_VERSION_STR, "platform": sys.platform,
+              "width": w, "height": h, "results": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"wrote {args.out}")
+    if args.compare:
+        compare_render(args.compare, report)
+
+
+def compare_render(path, report):
+    with open(path) as f:
+        old = json.load(f)
+    before = {(r["shape"], r["num_dots"], r["max_size"]): r for r in old["results"]}
+    print(f"\ncompared with {path} ({old.get('commit') or 'unknown commit'}), p95 frame time:")
+    for r in report["results"]:
+        o = before.get((r["shape"], r["num_dots"], r["max_size"]))
+        if o:
+            change = (r["p95_ms"] - o["p95_ms"]) / o["p95_ms"] if o["p95_ms"] else 0.0
+            print(f"{r['shape']:>10} {r['num_dots']:>5} {r['max_size']:>4} {o['p95_ms']:>8.3f} -> {r['p95_ms']:>8.3f} ms  {change:+.1%}")
+
+
+def bench_snapshots(args):
+    import threading
+    import numpy as np
+    from worker import SnapshotBuffer
+    # Force frequent thread switches so a reader lands mid-write as often as possible
+    sys.setswitchinterval(1e-6)
+
+    def check(read, publish):
+        # Writer stamps every dot with a generation number in two parts, like Trail.step moving the lead then the rest;
+        # the reader checks a frame's halves agree, yielding in between as a paint would
+        stop, torn, reads = threading.Event(), 0, 0
+
+        def writer():
+            gen, data = 0, np.zeros((args.dots, 2))
+            while not stop.is_set():
+                gen += 1
+                publish(data, gen)
+
+        t = threading.Thread(target=writer)
+        t.start()
+        end = time.perf_counter() + args.seconds
+        while time.perf_counter() < end:
+            frame = read()
+            first = frame[: args.dots // 2].copy()
+            time.sleep(0)
+            rest = frame[args.dots // 2:]
+            reads += 1
+            if first.min() != first.max() or rest.min() != rest.max() or first[0, 0] != rest[0, 0]:
+                torn += 1
+        stop.set()
+        t.join()
+        return reads, torn
+
+    shared = np.zeros((args.dots, 2))
+
+    def publish_shared(data, gen):
+        shared[: args.dots // 2] = gen
+        time.sleep(0)
+        shared[args.dots // 2:] = gen
+
+    buffer = SnapshotBuffer(args.dots)
+
+    def publish_buffered(data, gen):
+        data[: args.dots // 2] = gen
+        time.sleep(0)
+        data[args.dots // 2:] = gen
+        buffer.publish(data)
+
+    reads, torn = check(lambda: shared, publish_shared)
+    print(f"shared array:    {reads} reads, {torn} torn")
+    reads, torn = check(buffer.read, publish_buffered)
+    print(f"snapshot buffer: {reads} reads, {torn} torn")
+    if torn:
+        sys.exit(1)
+
+
+def bench_animation(args):
+    from PyQt6.QtGui import QGuiApplication, QPainter
+    from shapes import Animation, paint_trail
+    app = QGuiApplication.instance() or QGuiApplication([])
+    animation = Animation(args.path)
+    trail = settle(Trail(args.dots, 960, 540))
+    image = render_target()
+    settings = Settings(shape="Image", max_size=args.max_size)
+    print(f"{'budget MB':>10} {'sprites MB':>11} {'peak MB':>8} {'size step':>10} {'prepare ms':>11} {'paint p50 ms':>13}")
+    for budget in args.budget_mb:
+        animation.sprites = []
+        t0 = time.perf_counter()
+        animation.prepare(args.max_size, budget * 2 ** 20)
+        prepare_ms = (time.perf_counter() - t0) * 1000
+        # Qt's pixel buffers sit outside Python's allocator: resident cost is the sprites plus one frame being decoded
+        peak = animation.sprite_bytes + animation.frame_bytes
+
+        def frame(i):
+            animation.seek(i * animation.min_delay / 1000)
+            painter = QPainter(image)
+            paint_trail(painter, animation, trail.pos, settings)
+            painter.end()
+        samples = timed(frame, [(i,) for i in range(args.frames)])
+        print(f"{budget:>10} {animation.sprite_bytes / 2 ** 20:>11.2f} {peak / 2 ** 20:>8.2f} {animation.step:>10} "
+              f"{prepare_ms:>11.0f} {percentile(samples, 50):>13.3f}")
+    print(f"{len(animation.sprites)} frames, {animation.duration} ms loop, shortest frame {animation.min_delay} ms, "
+          f"largest decoded frame {animation.frame_bytes / 2 ** 20:.2f} MB")
+
+
+def bench_settings(args):
+    # One thread rewrites settings.json between two states while this one reads it back; a read is torn when the
+    # file doesn't parse or mixes the two. Writes of different lengths make truncated in-place rewrites visible.
+    import tempfile, threading
+    from PyQt6.QtCore import QCoreApplication
+    import overlay
+    app = QCoreApplication.instance() or QCoreApplication([])
+    path = os.path.join(tempfile.mkdtemp(), "settings.json")
+    states = [Settings(num_dots=n, sample_hz=n, image_path="x" * n) for n in (10, 1000)]
+
+    def write_in_place(s, path):
+        with open(path, "w") as f:
+            json.dump(s.to_dict(), f, indent=4)
+
+    def check(write):
+        write(states[0], path)
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                write(states[i % 2], path)
+                i += 1
+        t = threading.Thread(target=writer)
+        t.start()
+        reads = torn = 0
+        end = time.perf_counter() + args.seconds
+        while time.perf_counter() < end:
+            try:
+                s = config.read(path)
+                ok = s.num_dots == s.sample_hz == len(s.image_path)
+            except (OSError, ValueError):
+                ok = False
+            reads += 1
+            torn += not ok
+        stop.set()
+        t.join()
+        return reads, torn
+
+    reads, torn = check(write_in_place)
+    print(f"in-place writes: {reads} reads, {torn} torn")
+    reads, atomic_torn = check(config.write)
+    print(f"atomic writes:   {reads} reads, {atomic_torn} torn")
+
+    # A burst of edits, like dragging in the color dialog, should reach the disk once, after it ends
+    writes = []
+    save = overlay.save_settings
+    overlay.save_settings = lambda s, path: (writes.append(s), save(s, path))
+    store = overlay.SettingsStore(path)
+    end = time.perf_counter() + args.burst
+    updates = 0
+    while time.perf_counter() < end:
+        store.update(store.data.replace(color=(updates % 256, 0, 0)))
+        updates += 1
+        app.processEvents()
+        time.sleep(0.005)
+    while store.save_timer.isActive():
+        app.processEvents()
+        time.sleep(0.01)
+    overlay.save_settings = save
+    saved = config.read(path) == store.data
+    print(f"debounced store: {updates} updates over {args.burst:g} s -> {len(writes)} write(s), file {'matches' if saved else 'DIFFERS'}")
+    if atomic_torn or not saved:
+        sys.exit(1)
+
+
+def send_pointers(address, count, rate, seconds):
+    # One datagram per pointer update, as separate participants would send them, each pointer circling its own spot
+    import socket
+    from pointers import encode
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.perf_counter()
+    for tick in range(int(seconds * rate)):
+        delay = start + tick / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        a = tick / rate * 3
+        for pid in range(count):
+            cx, cy = 160 + (pid % 10) * 170, 140 + (pid // 10) * 200
+            sock.sendto(encode([(pid, int(cx + 60 * math.cos(a + pid)), int(cy + 60 * math.sin(a + pid)))]), address)
+
+
+def bench_pointers(args):
+    # Real-time load: a sender process streams pointer updates while this one runs overlay frames on a 60 FPS
+    # schedule; a frame is dropped when this process's work for it, feed thread included, overruns the frame period.
+    # That is CPU time, so the sender being scheduled in on a machine with few cores doesn't count against the overlay.
+    import multiprocessing
+    from PyQt6.QtWidgets import QApplication
+    import overlay
+    app = QApplication.instance() or QApplication([])
+    settings = Settings(num_dots=args.dots, shape=args.shape, pointer_feed="udp:127.0.0.1:0", frame_budget_ms=0)
+    ov = overlay.Overlay(settings, PathCursor(cursor_path(100000)))
+    ov.timer.stop()
+    ov.setGeometry(0, 0, 1920, 1080)
+    sender = multiprocessing.get_context("spawn").Process(target=send_pointers, args=(ov.feed.bound, args.pointers, args.rate, args.seconds + 0.5))
+    sender.start()
+    period = 1 / 60
+    frames, cpu, visible, late = [], [], [], 0
+    while ov.feed.packets == 0 and sender.is_alive():
+        time.sleep(0.01)
+    next_at = time.perf_counter()
+    end = next_at + args.seconds
+    while next_at < end:
+        t0, c0 = time.perf_counter(), time.process_time()
+        ov.update_overlay()
+        app.processEvents()     # paints the dirty region, as the shown overlay does
+        frames.append((time.perf_counter() - t0) * 1000)
+        cpu.append((time.process_time() - c0) * 1000)
+        visible.append(len(ov.pointers))
+        next_at += period
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            late += 1
+            next_at = time.perf_counter()
+    packets, bad = ov.feed.packets, ov.feed.dropped
+    sender.join()
+    ov.close()
+    expected = args.pointers * args.rate * args.seconds
+    # Frame 0 renders a sprite for every pointer's color at every dot size; later frames are cache hits
+    dropped = [i for i, ms in enumerate(cpu) if ms > period * 1000 and i > 0]
+    print(f"{args.pointers} pointers x {args.rate:g} updates/s for {args.seconds:g} s, {args.dots} dots each, {args.shape}")
+    print(f"datagrams: {packets} received (~{expected:.0f} sent in the window), {bad} malformed")
+    print(f"pointers on screen: min {min(visible)}  max {max(visible)}")
+    for name, ms in (("frame ms", frames), ("frame CPU ms", cpu)):
+        print(f"{name}: p50 {percentile(ms, 50):.3f}  p95 {percentile(ms, 95):.3f}  p99 {percentile(ms, 99):.3f}  max {max(ms):.3f}")
+    print(f"{len(frames)} frames, {len(dropped)} after the first over the {period * 1000:.1f} ms budget (frames {dropped[:10]}), {late} started late")
+    if dropped:
+        sys.exit(1)
+
+
+def synthetic_frame(load_ms, tier, rng, jitter):
+    # Frame cost model: dots drawn scale most of the cost, antialiasing adds a little, and a few frames spike
+    from governor import TIERS
+    _, antialias, share, _ = TIERS[tier]
+    ms = load_ms * (0.15 + 0.85 * share) * (1.1 if antialias else 1.0)
+    ms *= 1 + jitter * rng.standard_normal()
+    return max(0.1, ms * (2.5 if rng.random() < 0.01 else 1.0))
+
+
+def bench_governor(args):
+    # Feeds FrameGovernor synthetic frames: constant loads, then a load that jumps up and falls back. Converged means
+    # no tier change in the last half of a phase; oscillation shows up as changes that keep coming.
+    import numpy as np
+    from governor import FrameGovernor, TIERS
+    rng = np.random.default_rng(args.seed)
+    print(f"budget {args.budget:g} ms, {args.frames} frames per phase, jitter {args.jitter:.0%}")
+    print(f"{'load ms':>14} {'tiers':>28} {'changes':>8} {'settled at':>11} {'late':>5} {'p95 ms':>7} {'converged':>10}")
+    scenarios = [[load] for load in args.loads] + [[6, 40, 6]]
+    failed = 0
+    for loads in scenarios:
+        gov = FrameGovernor(args.budget)
+        changes, late, settled, path = 0, 0, 0, []
+        for load in loads:
+            for i in range(args.frames):
+                if gov.add(synthetic_frame(load, gov.tier, rng, args.jitter)):
+                    changes += 1
+                    late += i >= args.frames // 2
+                    settled = max(settled, i)
+            path.append(TIERS[gov.tier][0])
+        name = " -> ".join(f"{l:g}" for l in loads)
+        failed += bool(late)
+        print(f"{name:>14} {' -> '.join(path):>28} {changes:>8} {settled:>11} {late:>5} {gov.p95():>7.2f} {'yes' if not late else 'NO':>10}")
+    print("p95 is per 1/60 s, so a lower tick rate divides it; a load the lowest tier can't bring under budget stays over")
+    if failed:
+        print(f"{failed} of {len(scenarios)} scenarios still changing tier in the last half of a phase")
+        sys.exit(1)
+
+
+STARTUP_PROBE = """
+import os, sys, time
+sys.argv = ["overlay.py"]
+import overlay
+from PyQt6.QtCore import QTimer
+paint = overlay.MainWindow.paintEvent
+
+def first_paint(self, event):
+    paint(self, event)
+    # Let the children finish this paint pass, then report and leave
+    QTimer.singleShot(0, lambda: (print(time.perf_counter(), flush=True), os._exit(0)))
+
+overlay.MainWindow.paintEvent = first_paint
+overlay.main()
+"""
+
+
+def bench_startup(args):
+    # perf_counter is system-wide, so the child's first-paint stamp is comparable with the parent's launch stamp
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=here, capture_output=True, text=True, timeout=60)
+        samples.append((float(out.stdout.split()[-1]) - t0) * 1000)
+    print(f"process start to first paint over {args.runs} runs: p50 {percentile(samples, 50):.1f} ms  "
+          f"min {min(samples):.1f} ms  max {max(samples):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mouse Follower micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("physics", help="Trail.step against the old list-of-QPointF chase")
+    p.add_argument("--dots", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    p.add_argument("--ticks", type=int, default=600)
+    p.set_defaults(func=bench_physics)
+    p = sub.add_parser("spline", help="Largest gap between neighbouring dots on fast moves, chase against spline trail")
+    p.add_argument("--dots", type=int, nargs="+", default=[10, 20, 50])
+    p.add_argument("--ticks", type=int, default=600)
+    p.add_argument("--speed", type=float, default=4)
+    p.set_defaults(func=bench_spline)
+    p = sub.add_parser("particles", help="Emit, integrate, cull and paint a constant particle load; p95 must fit a 60 FPS frame")
+    p.add_argument("--count", type=int, default=10000)
+    p.add_argument("--effects", nargs="+", help="defaults to every effect")
+    p.add_argument("--shapes", nargs="+", default=["Circle", "Star", "Square"])
+    p.add_argument("--max-size", type=int, default=20)
+    p.add_argument("--frames", type=int, default=300)
+    p.set_defaults(func=bench_particles)
+    p = sub.add_parser("shapes", help="Frame time per shape, per-dot drawing against cached sprites")
+    p.add_argument("--dots", type=int, default=100)
+    p.add_argument("--max-size", type=int, default=20)
+    p.add_argument("--frames", type=int, default=100)
+    p.set_defaults(func=bench_shapes)
+    p = sub.add_parser("dirty", help="Pixels repainted per frame with dirty-region updates")
+    p.add_argument("--dots", type=int, default=10)
+    p.add_argument("--max-size", type=int, default=20)
+    p.add_argument("--frames", type=int, default=300)
+    p.add_argument("--width", type=int, default=3840)
+    p.add_argument("--height", type=int, default=2160)
+    p.set_defaults(func=bench_dirty)
+    p = sub.add_parser("trace", help="Write a synthetic cursor trace for replay")
+    p.add_argument("out")
+    p.add_argument("--seconds", type=float, default=10)
+    p.add_argument("--width", type=int, default=1920)
+    p.add_argument("--height", type=int, default=1080)
+    p.set_defaults(func=bench_trace)
+    p = sub.add_parser("replay", help="Drive a headless Overlay from a recorded trace and report frame times")
+    p.add_argument("trace")
+    p.add_argument("--settings", help="settings.json to replay with (defaults otherwise)")
+    p.add_argument("--hz", type=float, default=60)
+    p.add_argument("--spikes", type=int, default=5, help="number of slowest frames to list")
+    p.set_defaults(func=bench_replay)
+    p = sub.add_parser("render", help="Sweep Overlay.paintEvent over shapes, dot counts and sizes; write JSON to compare commits")
+    p.add_argument("--shapes", nargs="+", help="defaults to every shape in the settings dropdown")
+    p.add_argument("--dots", type=int, nargs="+", default=[10, 100, 500, 1000, 5000])
+    p.add_argument("--max-size", type=int, nargs="+", default=[8, 20, 48])
+    p.add_argument("--frames", type=int, default=60)
+    p.add_argument("--warmup", type=int, default=10)
+    p.add_argument("--alloc-frames", type=int, default=5)
+    p.add_argument("--color-mode", default="Solid", help="trail coloring, e.g. Gradient or Rainbow")
+    p.add_argument("--easing", default="Linear", help="size and opacity falloff curve")
+    p.add_argument("--width", type=int, default=1920)
+    p.add_argument("--height", type=int, default=1080)
+    p.add_argument("--out", help="write results as JSON")
+    p.add_argument("--compare", metavar="JSON", help="print p95 changes against an earlier --out file")
+    p.set_defaults(func=bench_render)
+    p = sub.add_parser("snapshots", help="Check the worker's snapshot hand-off never shows the painter a half-updated frame")
+    p.add_argument("--dots", type=int, default=1000)
+    p.add_argument("--seconds", type=float, default=3)
+    p.set_defaults(func=bench_snapshots)
+    p = sub.add_parser("animation", help="Memory and frame time for an animated GIF/WebP under several cache budgets")
+    p.add_argument("path")
+    p.add_argument("--dots", type=int, default=100)
+    p.add_argument("--max-size", type=int, default=48)
+    p.add_argument("--budget-mb", type=float, nargs="+", default=[64, 16, 4, 1])
+    p.add_argument("--frames", type=int, default=200)
+    p.set_defaults(func=bench_animation)
+    p = sub.add_parser("settings", help="Stress settings.json with a concurrent reader and writer, and check write debouncing")
+    p.add_argument("--seconds", type=float, default=2)
+    p.add_argument("--burst", type=float, default=1, help="seconds of continuous edits sent through the store")
+    p.set_defaults(func=bench_settings)
+    p = sub.add_parser("pointers", help="Load test the remote pointer feed: many senders' updates against a 60 FPS frame schedule")
+    p.add_argument("--pointers", type=int, default=50)
+    p.add_argument("--rate", type=float, default=120, help="updates per second per pointer")
+    p.add_argument("--seconds", type=float, default=5)
+    p.add_argument("--dots", type=int, default=10)
+    p.add_argument("--shape", default="Circle")
+    p.set_defaults(func=bench_pointers)
+    p = sub.add_parser("governor", help="Feed the frame-budget governor synthetic loads and check it settles without oscillating")
+    p.add_argument("--budget", type=float, default=12)
+    p.add_argument("--loads", type=float, nargs="+", default=[4, 8, 11, 14, 20, 29, 60, 120],
+                   help="full-quality frame cost in ms for each constant-load run")
+    p.add_argument("--frames", type=int, default=6000, help="frames per phase")
+    p.add_argument("--jitter", type=float, default=0.1)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_governor)
+    p = sub.add_parser("startup", help="Time from process start to the main window's first paint")
+    p.add_argument("--runs", type=int, default=10)
+    p.set_defaults(func=bench_startup)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
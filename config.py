@@ -0,0 +1,124 @@
+import json, math, os, time
+
+WINDOW_MODES = ["Full Screen", "Follow Trail"]
+TRAIL_MODES = ["Chase", "Spline"]
+EFFECTS = ["None", "Sparks", "Dust", "Confetti"]
+# The one list of palette and falloff names; shapes defines a palette or curve for each and checks it covers them
+PALETTES = ["Rainbow", "Fire", "Ocean"]
+COLOR_MODES = ["Solid", "Gradient"] + PALETTES
+EASINGS = ["Linear", "Ease In", "Ease Out", "Ease In Out", "None"]
+
+# name: (type, default, low, high); numbers are clamped into [low, high], choices are a list in place of the bounds
+FIELDS = {
+    "num_dots": (int, 10, 1, 10000),
+    "follow_speed": (float, 0.25, 0.01, 1.0),
+    "lag_speed": (float, 0.20, 0.0, 0.99),
+    "max_size": (float, 20.0, 1.0, 256.0),
+    "color": (tuple, (0, 255, 255), 0, 255),
+    "color_mode": (str, "Solid", COLOR_MODES, None),
+    "color_end": (tuple, (255, 0, 255), 0, 255),
+    "size_easing": (str, "Linear", EASINGS, None),
+    "opacity_easing": (str, "Linear", EASINGS, None),
+    "shape": (str, "Circle", None, None),
+    "image_path": (str, "", None, None),
+    "window_mode": (str, "Full Screen", WINDOW_MODES, None),
+    "trail_mode": (str, "Chase", TRAIL_MODES, None),
+    "effect": (str, "None", EFFECTS, None),
+    "sample_hz": (int, 0, 0, 2000),
+    "frame_budget_ms": (float, 12.0, 0.0, 1000.0),     # per 1/60 s; over it, quality steps down. 0 turns that off
+    "image_cache_mb": (int, 64, 1, 4096),
+    "pointer_feed": (str, "", None, None),      # udp:HOST:PORT or unix:PATH to show remote pointers; empty is off
+}
+# On Windows a reader holding settings.json open makes the rename fail for a moment
+REPLACE_RETRIES = 20
+
+
+def coerce(name, value):
+    # Raises ValueError for a value that can't be read as the field's type; in-range clamping never fails
+    kind, default, low, high = FIELDS[name]
+    if kind is str:
+        if not isinstance(value, str):
+            raise ValueError(f"{name} must be text")
+        if isinstance(low, list) and value not in low:
+            raise ValueError(f"{name} must be one of {', '.join(low)}")
+        return value
+    if kind is tuple:
+        if isinstance(value, str) or len(value) != len(default):
+            raise ValueError(f"{name} needs {len(default)} components")
+        # JSON allows Infinity and 1e999, which int() can't take
+        if not all(math.isfinite(float(c)) for c in value):
+            raise ValueError(f"{name} components must be finite numbers")
+        return tuple(min(max(int(c), low), high) for c in value)
+    try:
+        number = float(value)
+    except TypeError:
+        raise ValueError(f"{name} must be a number") from None
+    if isinstance(value, bool) or not math.isfinite(number):
+        raise ValueError(f"{name} must be a number")
+    # int("2.5") fails, so integer fields go through float and round
+    return min(max(round(number) if kind is int else number, low), high)
+
+
+class Settings:
+    # Typed, validated settings; the overlay and worker read attributes on every tick, so no dict lookups there.
+    # Treated as immutable once built: changes go through replace(), which lets threads share one safely.
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, **values):
+        for name, (kind, default, low, high) in FIELDS.items():
+            setattr(self, name, coerce(name, values.pop(name)) if name in values else default)
+        if values:
+            raise TypeError(f"unknown settings: {', '.join(values)}")
+
+    @classmethod
+    def from_dict(cls, d):
+        # Lenient: unknown keys are dropped and unreadable values fall back to their defaults
+        s = cls()
+        for name in FIELDS:
+            if name in d:
+                try:
+                    setattr(s, name, coerce(name, d[name]))
+                except (TypeError, ValueError):
+                    pass
+        return s
+
+    def replace(self, **changes):
+        return Settings(**{**self.to_dict(), **changes})
+
+    def to_dict(self):
+        d = {name: getattr(self, name) for name in FIELDS}
+        d["color"] = list(self.color)
+        d["color_end"] = list(self.color_end)
+        return d
+
+    def __eq__(self, other):
+        return isinstance(other, Settings) and all(getattr(self, n) == getattr(other, n) for n in FIELDS)
+
+    def __repr__(self):
+        return f"Settings({', '.join(f'{n}={getattr(self, n)!r}' for n in FIELDS)})"
+
+
+def read(path):
+    with open(path, "r") as f:
+        d = json.load(f)
+    if not isinstance(d, dict):
+        raise ValueError(f"{path}: settings must be a JSON object")
+    return Settings.from_dict(d)
+
+
+def write(settings, path):
+    # Write a sibling temp file and rename it over the old one, so a reader sees the old file or the new, never half
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(settings.to_dict(), f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(tmp, path)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                os.remove(tmp)
+                raise
+            time.sleep(0.005)
@@ -0,0 +1,107 @@
+import bisect, struct, sys, time
+
+# Trace file: magic, then one record per cursor change of (microseconds since start, x, y)
+TRACE_MAGIC = b"MFT1"
+TRACE_RECORD = struct.Struct("<Qii")
+
+
+class CursorSource:
+    thread_safe = False     # pos() may be called from a thread other than the GUI thread, e.g. TrailWorker's
+
+    def pos(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class Win32Cursor(CursorSource):
+    thread_safe = True
+
+    def __init__(self):
+        import win32api
+        self._get = win32api.GetCursorPos
+
+    def pos(self):
+        return self._get()
+
+
+class QtCursor(CursorSource):
+    # QCursor.pos() is only documented for the GUI thread, so with this source the overlay never samples off it
+    def __init__(self):
+        from PyQt6.QtGui import QCursor
+        self._cursor = QCursor
+
+    def pos(self):
+        p = self._cursor.pos()
+        return p.x(), p.y()
+
+
+def default_cursor():
+    return Win32Cursor() if sys.platform == "win32" else QtCursor()
+
+
+def read_trace(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(f"{path} is not a cursor trace")
+    body = data[len(TRACE_MAGIC):]
+    body = body[:len(body) - len(body) % TRACE_RECORD.size]
+    return [(t / 1e6, x, y) for t, x, y in TRACE_RECORD.iter_unpack(body)]
+
+
+class ReplayCursor(CursorSource):
+    # Plays a recorded trace back against a clock; pass a fake clock to step through it deterministically
+    thread_safe = True
+
+    def __init__(self, path, clock=time.perf_counter, loop=False):
+        self.samples = read_trace(path)
+        if not self.samples:
+            raise ValueError(f"{path} has no samples")
+        self.times = [t for t, _, _ in self.samples]
+        self.clock = clock
+        self.loop = loop
+        self.start = clock()
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    @property
+    def done(self):
+        return not self.loop and self.clock() - self.start >= self.duration
+
+    def pos(self):
+        t = self.clock() - self.start
+        if self.loop and self.duration > 0:
+            t %= self.duration
+        i = max(0, bisect.bisect_right(self.times, t) - 1)
+        _, x, y = self.samples[i]
+        return x, y
+
+
+class TraceRecorder(CursorSource):
+    # Wraps another source and appends every position change to a trace file
+    def __init__(self, source, path, clock=time.perf_counter):
+        self.source = source
+        self.clock = clock
+        self.start = clock()
+        self.last = None
+        self.file = open(path, "wb")
+        self.file.write(TRACE_MAGIC)
+
+    @property
+    def thread_safe(self):
+        return self.source.thread_safe
+
+    def pos(self):
+        p = self.source.pos()
+        if p != self.last and not self.file.closed:
+            self.last = p
+            self.file.write(TRACE_RECORD.pack(int((self.clock() - self.start) * 1e6), p[0], p[1]))
+        return p
+
+    def close(self):
+        self.file.close()
+        self.source.close()
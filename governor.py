@@ -0,0 +1,84 @@
+import numpy as np
+
+REFERENCE_MS = 1000 / 60
+# Quality tiers, best first: (label, antialiasing, share of the trail's dots drawn, frame interval in ms). Each step
+# down gives up the cheapest thing to lose first.
+TIERS = [
+    ("High", True, 1.0, 16),
+    ("No AA", False, 1.0, 16),
+    ("Half Dots", False, 0.5, 16),
+    ("Quarter Dots", False, 0.25, 16),
+    ("30 FPS", False, 0.25, 33),
+    ("20 FPS", False, 0.25, 50),
+]
+GOVERNOR_WINDOW = 60        # frames per p95 block; the tier is judged once a block, on frames drawn at that tier
+OVER_BLOCKS = 2             # blocks in a row over budget before stepping down; one block is enough past twice the budget
+STEP_UP_MARGIN = 0.8        # step back up only when the better tier is predicted under this share of the budget
+DEFAULT_RATIO = 2.0         # assumed cost of a tier against the one below until a step down has measured it
+HOLD_FRAMES = 240           # frames at a tier before trying the better one
+MAX_HOLD_FRAMES = 15360     # cap on the hold after repeated failed step-ups (~4 min at 60 FPS)
+
+
+class FrameGovernor:
+    # Keeps the overlay's frame cost under budget_ms per 1/60 s. Frame times are scaled by the frame interval, so a
+    # lower tick rate counts as the load it takes off the machine. Hysteresis against flipping between two tiers:
+    # stepping down needs a sustained overrun, and stepping up needs the better tier's predicted p95 under
+    # STEP_UP_MARGIN of the budget. The prediction uses the cost ratio between the two tiers, measured on the last
+    # step down between them. A step up that is undone straight away doubles the wait before the next try; one that
+    # holds halves it again.
+    def __init__(self, budget_ms, window=GOVERNOR_WINDOW, hold=HOLD_FRAMES):
+        self.budget_ms = budget_ms
+        self.samples = np.zeros(window)
+        self.count = 0              # frames measured at the current tier
+        self.over = 0               # blocks in a row over budget
+        self.last_p95 = 0.0
+        self.tier = 0
+        self.ratio = [None] * len(TIERS)     # ratio[t]: p95 at tier t over p95 at tier t + 1
+        self.left_p95 = None        # p95 of the last block at the tier just stepped down from
+        self.base_hold = hold
+        self.hold = hold
+        self.probing = False        # the current tier was reached by stepping up and hasn't held for a hold yet
+
+    @property
+    def label(self):
+        return TIERS[self.tier][0]
+
+    def settings(self):
+        return TIERS[self.tier][1:]
+
+    def p95(self):
+        # Of the last full block
+        return self.last_p95
+
+    def add(self, frame_ms):
+        # Records one frame; returns True when the tier changed
+        interval = TIERS[self.tier][3]
+        window = len(self.samples)
+        self.samples[self.count % window] = frame_ms * REFERENCE_MS / interval
+        self.count += 1
+        if self.count % window:
+            return False
+        self.last_p95 = p95 = float(np.percentile(self.samples, 95))
+        if self.left_p95 is not None:
+            self.ratio[self.tier - 1] = max(1.0, self.left_p95 / max(p95, 1e-6))
+            self.left_p95 = None
+        self.over = self.over + 1 if p95 > self.budget_ms else 0
+        if (self.over >= OVER_BLOCKS or p95 > 2 * self.budget_ms) and self.tier < len(TIERS) - 1:
+            if self.probing:
+                self.hold = min(self.hold * 2, MAX_HOLD_FRAMES)
+            self.left_p95 = p95
+            self._move(self.tier + 1, probing=False)
+            return True
+        if self.probing and self.count >= self.hold:
+            self.probing = False
+            self.hold = max(self.base_hold, self.hold // 2)
+        if self.tier > 0 and self.count >= self.hold and p95 * (self.ratio[self.tier - 1] or DEFAULT_RATIO) < self.budget_ms * STEP_UP_MARGIN:
+            self._move(self.tier - 1, probing=True)
+            return True
+        return False
+
+    def _move(self, tier, probing):
+        self.tier = tier
+        self.count = 0
+        self.over = 0
+        self.probing = probing
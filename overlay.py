@@ -1,11 +1,35 @@
-import sys, json, win32api, win32con, win32gui, math
+import sys, time, argparse, functools, importlib.util, itertools
 from PyQt6.QtWidgets import (QApplication, QWidget, QColorDialog, QPushButton, QLabel, 
                               QLineEdit, QComboBox, QFileDialog, QVBoxLayout, QHBoxLayout,
-                              QStackedWidget, QFrame, QSpacerItem, QSizePolicy)
-from PyQt6.QtGui import QPainter, QColor, QBrush, QPolygonF, QPixmap, QFont, QIcon
-from PyQt6.QtCore import Qt, QTimer, QPointF, QRectF, QSize
-import qtawesome as qta
+                              QStackedWidget, QFrame, QScrollArea, QSpacerItem, QSizePolicy)
+from PyQt6.QtGui import QPainter, QColor, QPixmap, QFont, QIcon, QRegion
+from PyQt6.QtCore import Qt, QTimer, QSize, QRect, QObject, QFileSystemWatcher, pyqtSignal
 import os
+from cursor import default_cursor, ReplayCursor, TraceRecorder
+from shapes import SHAPES, SpriteCache, load_shape_dir, Animation, paint_trail, paint_pointers, trail_region
+from config import Settings, WINDOW_MODES, TRAIL_MODES, EFFECTS, COLOR_MODES, EASINGS
+import config
+
+def lazy_import(name):
+    # The module body runs on first attribute access, which keeps numpy and qtawesome off the startup path. A module
+    # already imported is shared, so there is never a second copy with its own state and caches.
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+qta = lazy_import("qtawesome")
+trail = lazy_import("trail")
+worker = lazy_import("worker")
+profiler = lazy_import("profiler")
+particles = lazy_import("particles")
+pointers = lazy_import("pointers")
+governor = lazy_import("governor")
 
 def get_icon_path():
     if getattr(sys, 'frozen', False):
@@ -13,6 +37,15 @@ def get_icon_path():
     return 'icon.ico'
 
 SETTINGS_FILE = "settings.json"
+SHAPE_DIR = "custom_shapes"     # SVGs dropped in here show up as shapes, named after the file
+
+FRAME_MS = 16
+IDLE_POLL_MS = 100      # cursor poll interval once the trail has caught up with a still cursor
+SAVE_DEBOUNCE_MS = 250
+HUD_RECT = QRect(16, 16, 200, 88)
+
+TRAIL_MARGIN = 64               # px of slack around the trail so the window isn't moved every frame
+TRAIL_WINDOW_MAX = QSize(1600, 1200)
 
 DARK_BG = "#0f1610"       # very dark soft green (almost black)
 CARD_BG = "#142015"       # muted dark green
@@ -20,6 +53,7 @@ ACCENT = "#1c4d1f"        # soft natural green (not bright)
 HIGHLIGHT = "#3e7a47"     # gentle highlight green, not saturated
 TEXT = "#c4cfd1"
 TEXT_DIM = "#c4cfd1"
+ERROR = "#b3473e"
 
 STYLE = f"""
 QWidget {{
@@ -64,154 +98,499 @@ QLabel {{
 }}
 """
 
-def load_settings():
+NAV_ACTIVE_STYLE = f"background: transparent; color: {HIGHLIGHT}; font-size: 15px; font-weight: bold;"
+NAV_IDLE_STYLE = f"background: transparent; color: {TEXT_DIM}; font-size: 15px; font-weight: bold;"
+START_BTN_STYLE = f"QPushButton {{background-color: {HIGHLIGHT}; border-radius: 16px;}} QPushButton:hover {{background-color: #3d5c3d;}}"
+STOP_BTN_STYLE = f"QPushButton {{background-color: {ACCENT}; border-radius: 16px;}} QPushButton:hover {{background-color: #3d5c3d;}}"
+INPUT_ERROR_STYLE = f"border: 2px solid {ERROR};"
+
+@functools.lru_cache(maxsize=None)
+def icon(name, color):
+    # Each icon is rendered once; buttons that flip between states reuse the same QIcon
+    return qta.icon(name, color=color)
+
+@functools.lru_cache(maxsize=None)
+def icon_pixmap(name, color, size=64):
+    return icon(name, color).pixmap(QSize(size, size))
+
+def load_settings(path=SETTINGS_FILE):
+    # A missing file is created with the defaults; an unreadable one is left as is rather than overwritten
     try:
-        with open(SETTINGS_FILE, "r") as f:
-            return json.load(f)
-    except:
-        default = {"num_dots": 10, "follow_speed": 0.25, "lag_speed": 0.20, "max_size": 20, "color": [0, 255, 255], "shape": "Circle", "image_path": ""}
-        save_settings(default)
-        return default
-
-def save_settings(s):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(s, f, indent=4)
-
-def draw_shape(painter, shape, pos, size, color, pixmap=None):
-    painter.setBrush(QBrush(color))
-    size = max(1, int(size))
-    x, y = pos.x(), pos.y()
-
-    if shape == "Image" and pixmap and not pixmap.isNull():
-        scaled = pixmap.scaled(size * 2, size * 2, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        painter.setOpacity(color.alphaF())
-        painter.drawPixmap(int(x), int(y), scaled)
-        painter.setOpacity(1.0)
-        return
-    if shape == "Circle":
-        painter.drawEllipse(QPointF(x + size, y + size), size, size)
-    elif shape == "Square":
-        painter.drawRect(int(x), int(y), size * 2, size * 2)
-    elif shape == "Diamond":
-        poly = QPolygonF([QPointF(x + size, y), QPointF(x + size * 2, y + size), QPointF(x + size, y + size * 2), QPointF(x, y + size)])
-        painter.drawPolygon(poly)
-    elif shape == "Triangle":
-        poly = QPolygonF([QPointF(x + size, y), QPointF(x + size * 2, y + size * 2), QPointF(x, y + size * 2)])
-        painter.drawPolygon(poly)
-    elif shape == "Star":
-        poly = QPolygonF()
-        cx, cy = x + size, y + size
-        for i in range(10):
-            angle = i * math.pi / 5 - math.pi / 2
-            r = size if i % 2 == 0 else size // 2
-            poly.append(QPointF(cx + r * math.cos(angle), cy + r * math.sin(angle)))
-        painter.drawPolygon(poly)
-    elif shape == "Hexagon":
-        poly = QPolygonF()
-        cx, cy = x + size, y + size
-        for i in range(6):
-            angle = i * math.pi / 3
-            poly.append(QPointF(cx + size * math.cos(angle), cy + size * math.sin(angle)))
-        painter.drawPolygon(poly)
-    elif shape == "Pentagon":
-        poly = QPolygonF()
-        cx, cy = x + size, y + size
-        for i in range(5):
-            angle = i * 2 * math.pi / 5 - math.pi / 2
-            poly.append(QPointF(cx + size * math.cos(angle), cy + size * math.sin(angle)))
-        painter.drawPolygon(poly)
-    elif shape == "Heart":
-        poly = QPolygonF()
-        cx, cy = x + size, y + size
-        for i in range(100):
-            t = i * 2 * math.pi / 100
-            hx = 16 * math.sin(t) ** 3
-            hy = -(13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t))
-            poly.append(QPointF(cx + hx * size / 17, cy + hy * size / 17))
-        painter.drawPolygon(poly)
-    elif shape == "Cross":
-        w = size // 3
-        cx, cy = x + size, y + size
-        poly = QPolygonF([QPointF(cx - w, cy - size), QPointF(cx + w, cy - size), QPointF(cx + w, cy - w), QPointF(cx + size, cy - w), QPointF(cx + size, cy + w), QPointF(cx + w, cy + w), QPointF(cx + w, cy + size), QPointF(cx - w, cy + size), QPointF(cx - w, cy + w), QPointF(cx - size, cy + w), QPointF(cx - size, cy - w), QPointF(cx - w, cy - w)])
-        painter.drawPolygon(poly)
-    elif shape == "Crescent":
-        from PyQt6.QtGui import QPainterPath
-        cx, cy = x + size, y + size
-        path = QPainterPath()
-        path.addEllipse(QRectF(cx - size, cy - size, size * 2, size * 2))
-        inner = QPainterPath()
-        inner.addEllipse(QRectF(cx - size * 0.3, cy - size, size * 1.8, size * 2))
-        path = path.subtracted(inner)
-        painter.drawPath(path)
-    elif shape == "Oval":
-        painter.drawEllipse(int(x), int(y), size * 2, size)
-    elif shape == "Arrow":
-        poly = QPolygonF([QPointF(x + size, y), QPointF(x + size * 2, y + size), QPointF(x + size * 1.5, y + size), QPointF(x + size * 1.5, y + size * 2), QPointF(x + size * 0.5, y + size * 2), QPointF(x + size * 0.5, y + size), QPointF(x, y + size)])
-        painter.drawPolygon(poly)
-    elif shape == "Mouse":
-        poly = QPolygonF([QPointF(x, y), QPointF(x, y + size * 1.6), QPointF(x + size * 0.3, y + size * 1.25), QPointF(x + size * 0.5, y + size * 1.7), QPointF(x + size * 0.75, y + size * 1.55), QPointF(x + size * 0.5, y + size * 1.1), QPointF(x + size * 1.0, y + size * 1.1)])
-        painter.drawPolygon(poly)
+        return config.read(path)
+    except FileNotFoundError:
+        s = Settings()
+        save_settings(s, path)
+        return s
+    except (OSError, ValueError):
+        return Settings()
+
+def save_settings(s, path=SETTINGS_FILE):
+    config.write(s, path)
+
+class SettingsStore(QObject):
+    # Single in-memory copy of the settings; changes are pushed to listeners instead of them re-reading the file.
+    # Writes trail the last change by SAVE_DEBOUNCE_MS, so a burst of edits costs one write.
+    changed = pyqtSignal(object)
+
+    def __init__(self, path=SETTINGS_FILE):
+        super().__init__()
+        self.path = path
+        self.data = load_settings(path)
+        self._mtime = self._stat()
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self.save_timer.timeout.connect(self._save)
+        self.watcher = QFileSystemWatcher([self.path])
+        self.watcher.fileChanged.connect(self._file_changed)
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def update(self, s):
+        self.data = s
+        self.save_timer.start()
+        self.changed.emit(self.data)
+
+    def refresh(self):
+        # Re-announce the settings unchanged, e.g. after the shape they name was redrawn, so sprites are rebuilt
+        self.changed.emit(self.data)
+
+    def flush(self):
+        # Write a pending change now, e.g. on quit
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            self._save()
+
+    def _save(self):
+        save_settings(self.data, self.path)
+        self._mtime = self._stat()
+
+    def _file_changed(self, path):
+        # Editors often replace the file on save, which drops it from the watcher; so does our own rename
+        if self.path not in self.watcher.files() and os.path.exists(self.path):
+            self.watcher.addPath(self.path)
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime or self.save_timer.isActive():
+            return
+        self._mtime = mtime
+        try:
+            s = config.read(self.path)
+        except (OSError, ValueError):
+            return
+        if s != self.data:
+            self.data = s
+            self.changed.emit(self.data)
+
+
+class ShapeFolder(QObject):
+    # Loads the SVGs in SHAPE_DIR into the shape registry and rescans when files are added, edited or removed.
+    # Copying a file fires a burst of events, so the rescan trails the last one like a settings write does.
+    changed = pyqtSignal()
+
+    def __init__(self, path=SHAPE_DIR):
+        super().__init__()
+        self.path = path
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError:
+            pass
+        self.scan_timer = QTimer(self)
+        self.scan_timer.setSingleShot(True)
+        self.scan_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self.scan_timer.timeout.connect(self.scan)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.scan_timer.start)
+        self.watcher.fileChanged.connect(self.scan_timer.start)
+        self.scan()
+
+    def scan(self):
+        changed = load_shape_dir(self.path)
+        # Directory events only cover files coming and going; edits in place need each file watched too
+        if os.path.isdir(self.path):
+            self.watcher.addPaths([self.path] + [os.path.join(self.path, e) for e in os.listdir(self.path) if e.lower().endswith(".svg")])
+        if changed:
+            self.changed.emit()
 
 
 class Overlay(QWidget):
-    def __init__(self, settings):
+    worker_woke = pyqtSignal()
+    quality_changed = pyqtSignal(str)
+    feed_changed = pyqtSignal(str)      # why the pointer feed couldn't start, or "" when it's running or off
+
+    def __init__(self, settings, cursor=None, clock=time.perf_counter, seed=None):
         super().__init__()
         self.settings = settings
+        self.seed = seed            # particle randomness; fixed for reproducible offline renders
+        self.cursor = cursor or default_cursor()
+        self.clock = clock
         self.pixmap = QPixmap()
+        self.animation = None
+        self.sprites = SpriteCache(dpr=self.devicePixelRatioF())
         self._load_image()
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        # Trail physics and the dirty region stay in global coordinates; painting maps them into the window
         screen = QApplication.primaryScreen().geometry()
-        self.setGeometry(screen)
-        self.dots = [QPointF(screen.width() // 2, screen.height() // 2) for _ in range(self.settings["num_dots"])]
+        self.follow_trail = self.settings.window_mode == "Follow Trail"
+        self.setGeometry(QRect(screen.center(), QSize(1, 1)) if self.follow_trail else screen)
+        self.trail = trail.make_trail(self.settings.trail_mode, self.settings.num_dots, screen.width() // 2, screen.height() // 2)
+        self.frame = self.trail.view
+        self.particles = None
+        self._make_particles()
+        self.dirty = QRegion()
+        # Profiling is off unless HomePage hands over a FrameProfiler; every hook below is a single None check then
+        self.profiler = None
+        self.hud = False
+        self.idle = False
+        self.last_cursor = None
+        self.last_tick = self.clock()
+        # With frame_budget_ms set, a FrameGovernor trades antialiasing, dots drawn and tick rate for frame time
+        self.governor = None
+        self.tick_start = self.tick_ms = 0.0
+        self.frame_ms = FRAME_MS
+        self.dot_stride = 1
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.update_overlay)
-        self.timer.start(16)
+        self._make_governor()
+        self.timer.start(self.frame_ms)
+        # With sample_hz set and a cursor source that can be read off the GUI thread, cursor sampling and physics move
+        # to a worker thread and the timer only presents snapshots
+        self.worker = None
+        self.last_seq = -1
+        self.worker_woke.connect(self.wake)
+        self._start_worker()
+        # With pointer_feed set, remote pointers arrive over a socket and each gets a trail of its own
+        self.feed = None
+        self.pointers = None
+        self._start_feed()
         self.show()
-        hwnd = int(self.winId())
-        win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) | win32con.WS_EX_LAYERED | win32con.WS_EX_TRANSPARENT)
+        if sys.platform == "win32":
+            import win32con, win32gui
+            hwnd = int(self.winId())
+            win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) | win32con.WS_EX_LAYERED | win32con.WS_EX_TRANSPARENT)
+
+    def closeEvent(self, event):
+        self._stop_worker()
+        self._stop_feed()
+        self.cursor.close()
+        super().closeEvent(event)
 
     def _load_image(self):
-        path = self.settings.get("image_path", "")
-        self.pixmap = QPixmap(path) if path else QPixmap()
+        path = self.settings.image_path
+        self.animation = Animation(path) if path and Animation.is_animated(path) else None
+        self.pixmap = QPixmap(path) if path and not self.animation else QPixmap()
+        self._prepare_animation()
 
-    def update_overlay(self):
-        mouse_x, mouse_y = win32api.GetCursorPos()
-        s = load_settings()
-        if s.get("image_path", "") != self.settings.get("image_path", ""):
-            self.settings = s
+    def _prepare_animation(self):
+        if self.animation:
+            self.animation.prepare(self.settings.max_size, self.settings.image_cache_mb * 1024 * 1024, self.sprites.dpr)
+
+    def _active_animation(self):
+        return self.animation if self.animation and self.settings.shape == "Image" else None
+
+    def _animate(self):
+        # While the trail rests, an animated image still needs its new frames shown
+        animation = self._active_animation()
+        if animation and animation.seek(self.clock()):
+            self.update(self.dirty.translated(-self.x(), -self.y()))
+
+    def _make_particles(self):
+        self.particles = particles.ParticleSystem(self.settings.effect, seed=self.seed) if self.settings.effect != "None" else None
+        self.particle_from = None
+        self.particle_tick = self.clock()
+
+    def _step_particles(self, frame):
+        # Particles come off the centre of the trail's lead dot, whichever thread moved it
+        now = self.clock()
+        dt = min(now - self.particle_tick, trail.MAX_DT)
+        self.particle_tick = now
+        if len(frame):
+            head = (float(frame[0, 0]) + self.settings.max_size, float(frame[0, 1]) + self.settings.max_size)
+            if self.particle_from:
+                self.particles.emit(*self.particle_from, *head, dt)
+            self.particle_from = head
+        self.particles.step(dt)
+
+    def _make_governor(self):
+        budget = self.settings.frame_budget_ms
+        self.governor = governor.FrameGovernor(budget) if budget > 0 else None
+        self._apply_quality()
+
+    def quality(self):
+        return self.governor.label if self.governor else governor.TIERS[0][0]
+
+    def _apply_quality(self):
+        antialias, share, interval = self.governor.settings() if self.governor else governor.TIERS[0][1:]
+        if antialias != self.sprites.antialias:
+            self.sprites.antialias = antialias
+            self.sprites.clear()
+        self.dot_stride = round(1 / share)
+        self.frame_ms = interval
+        if not self.idle:
+            self.timer.setInterval(interval)
+        self.quality_changed.emit(self.quality())
+
+    def _start_feed(self):
+        self.feed_error = None
+        address = self.settings.pointer_feed
+        if address:
+            try:
+                self.feed = pointers.PointerFeed(address, self.clock, self.worker_woke.emit)
+                self.feed.start()
+            except (OSError, ValueError) as e:
+                self.feed, self.feed_error = None, str(e)
+            else:
+                self.pointers = pointers.PointerTrails(self.settings.num_dots)
+                self.pointer_tick = self.clock()
+        self.feed_changed.emit(self.feed_error or "")
+
+    def _stop_feed(self):
+        if self.feed:
+            self.feed.stop()
+        self.feed = self.pointers = None
+
+    def _step_pointers(self):
+        now = self.clock()
+        dt = min(now - self.pointer_tick, trail.MAX_DT)
+        self.pointer_tick = now
+        self.pointers.apply(self.feed.take(), now)
+        self.pointers.advance(self.settings.follow_speed, self.settings.lag_speed, dt)
+
+    def _expire_pointers(self):
+        # Pointers that went quiet still time out, and disappear, while the overlay idles
+        if self.pointers is not None and self.pointers.stale(self.clock()):
+            self._present(self.frame)
+
+    def _busy(self):
+        # Flying particles, or remote pointers with updates pending or trails still moving, keep frames coming
+        # after the local trail has come to rest
+        if self.particles is not None and len(self.particles):
+            return True
+        return self.pointers is not None and (bool(self.feed.latest) or not self.pointers.settled(trail.SETTLE_EPS))
+
+    def _go_idle(self):
+        self.idle = True
+        if self.feed:
+            self.feed.sleeping = True
+        animation = self._active_animation()
+        self.timer.setInterval(min(IDLE_POLL_MS, animation.min_delay) if animation else IDLE_POLL_MS)
+
+    def _start_worker(self):
+        hz = self.settings.sample_hz
+        if hz > 0 and self.cursor.thread_safe:
+            self.worker = worker.TrailWorker(self.trail, self.cursor, self.settings, hz, IDLE_POLL_MS / 1000, self.worker_woke.emit, self.clock)
+            self.worker.start()
+
+    def _stop_worker(self):
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+            self.frame = self.trail.view
+
+    def set_profiler(self, profiler, hud=False):
+        self.profiler = profiler
+        self.hud = hud and profiler is not None
+        self.update()
+
+    def apply_settings(self, s):
+        prof = self.profiler
+        if prof:
+            t0 = time.perf_counter()
+        old = self.settings
+        self.settings = s
+        if s.sample_hz != old.sample_hz or s.trail_mode != old.trail_mode:
+            self._stop_worker()
+            if s.trail_mode != old.trail_mode:
+                # The new trail starts gathered on the old one's lead dot
+                x, y = self.trail.view[0] if len(self.trail) else (0, 0)
+                self.trail = trail.make_trail(s.trail_mode, s.num_dots, x, y)
+                self.frame = self.trail.view
+            self._start_worker()
+        elif self.worker:
+            self.worker.settings = s
+        if s.frame_budget_ms != old.frame_budget_ms:
+            self._make_governor()
+        if s.pointer_feed != old.pointer_feed:
+            self._stop_feed()
+            self._start_feed()
+        elif self.pointers is not None:
+            self.pointers.resize(s.num_dots)
+        if s.effect != old.effect:
+            self._make_particles()
+        if s.image_path != old.image_path:
             self._load_image()
-        else:
-            self.settings = s
-        if len(self.dots) != s["num_dots"]:
+        elif (s.max_size, s.image_cache_mb) != (old.max_size, old.image_cache_mb):
+            self._prepare_animation()
+        self.sprites.clear()
+        follow_trail = s.window_mode == "Follow Trail"
+        if follow_trail != self.follow_trail:
+            self.follow_trail = follow_trail
+            if not follow_trail:
+                self.setGeometry(QApplication.primaryScreen().geometry())
+        if not self.worker and len(self.trail) != s.num_dots:
             screen = QApplication.primaryScreen().geometry()
-            self.dots = [QPointF(screen.width() // 2, screen.height() // 2) for _ in range(s["num_dots"])]
-        if len(self.dots) < 1:
-            return
-        lead = self.dots[0]
-        lead.setX(lead.x() + (mouse_x - lead.x()) * s["follow_speed"])
-        lead.setY(lead.y() + (mouse_y - lead.y()) * s["follow_speed"])
-        for i in range(1, len(self.dots)):
-            prev, curr = self.dots[i - 1], self.dots[i]
-            curr.setX(curr.x() + (prev.x() - curr.x()) * s["lag_speed"])
-            curr.setY(curr.y() + (prev.y() - curr.y()) * s["lag_speed"])
+            self.trail.resize(s.num_dots, screen.width() // 2, screen.height() // 2)
+            self.frame = self.trail.view
+        self.wake()
         self.update()
+        if prof:
+            prof.add(profiler.SETTINGS, time.perf_counter() - t0)
+
+    def wake(self):
+        if self.idle:
+            self.idle = False
+            self.last_tick = self.clock() - self.frame_ms / 1000
+            self.timer.setInterval(self.frame_ms)
+
+    def update_overlay(self):
+        if self.governor:
+            self.tick_start = time.perf_counter()
+        if self.worker:
+            return self._present_snapshot()
+        prof = self.profiler
+        if prof:
+            t0 = time.perf_counter()
+        mouse_x, mouse_y = self.cursor.pos()
+        if (mouse_x, mouse_y) != self.last_cursor:
+            self.last_cursor = (mouse_x, mouse_y)
+            self.wake()
+        elif self.idle:
+            self._animate()
+            self._expire_pointers()
+            return
+        if prof:
+            t1 = time.perf_counter()
+            prof.begin(t0)
+            prof.add(profiler.CURSOR, t1 - t0)
+        now = self.clock()
+        dt = min(now - self.last_tick, trail.MAX_DT)
+        self.last_tick = now
+        s = self.settings
+        self.trail.advance(mouse_x, mouse_y, s.follow_speed, s.lag_speed, dt)
+        if prof:
+            prof.add(profiler.PHYSICS, time.perf_counter() - t1)
+        self._present(self.trail.view)
+        if self.trail.settled(mouse_x, mouse_y, trail.SETTLE_EPS) and not self._busy():
+            self._go_idle()
+
+    def _present_snapshot(self):
+        snapshots = self.worker.snapshots
+        if snapshots.seq == self.last_seq:
+            if self._busy():
+                self._present(self.frame)
+            elif self.worker.idle:
+                self._go_idle()
+                self._animate()
+                self._expire_pointers()
+            return
+        self.last_seq = snapshots.seq
+        if self.profiler:
+            # The worker's own timings for its latest sample stand in for the cursor and physics phases
+            self.profiler.begin(time.perf_counter())
+            cursor_s, physics_s = self.worker.step_time
+            self.profiler.add(profiler.CURSOR, cursor_s)
+            self.profiler.add(profiler.PHYSICS, physics_s)
+        # The pinned snapshot stays untouched by the worker until the next read, so paintEvent can draw it as is
+        self._present(snapshots.read())
+
+    def _present(self, frame):
+        self.frame = frame
+        # Repaint only where the trail was last frame and where it is now
+        region = trail_region(trail.bounds(frame), self.settings.max_size)
+        if self.particles is not None:
+            self._step_particles(frame)
+            if len(self.particles):
+                extent = self.particles.extent(self.settings.max_size)
+                region = region.united(trail_region(self.particles.bounds(self.settings.max_size), extent))
+        if self.pointers is not None:
+            self._step_pointers()
+            region = region.united(trail_region(self.pointers.bounds(), self.settings.max_size))
+        if self.follow_trail and self._fit_window(region.boundingRect()):
+            self.update()
+        else:
+            dirty = region.united(self.dirty).translated(-self.x(), -self.y())
+            self.update(dirty.united(HUD_RECT) if self.hud else dirty)
+        self.dirty = region
+        if self.governor:
+            self.tick_ms = (time.perf_counter() - self.tick_start) * 1000
+
+    def _fit_window(self, needed):
+        # Move/resize the window to cover the trail; returns True when the geometry changed
+        geo = self.geometry()
+        rect = needed.adjusted(-TRAIL_MARGIN, -TRAIL_MARGIN, TRAIL_MARGIN, TRAIL_MARGIN)
+        if self.hud:
+            rect.setSize(rect.size().expandedTo(QSize(HUD_RECT.right() + HUD_RECT.left(), HUD_RECT.bottom() + HUD_RECT.top())))
+        # Past the cap, keep the part of the trail nearest the cursor
+        lead_x, lead_y = (int(v) for v in self.frame[0]) if len(self.frame) else (rect.center().x(), rect.center().y())
+        if rect.width() > TRAIL_WINDOW_MAX.width():
+            rect.setLeft(lead_x - TRAIL_WINDOW_MAX.width() // 2)
+            rect.setWidth(TRAIL_WINDOW_MAX.width())
+        if rect.height() > TRAIL_WINDOW_MAX.height():
+            rect.setTop(lead_y - TRAIL_WINDOW_MAX.height() // 2)
+            rect.setHeight(TRAIL_WINDOW_MAX.height())
+        # Keep a window that already fits unless it has become much larger than needed
+        if geo.contains(needed.intersected(rect)) and geo.width() * geo.height() <= 4 * rect.width() * rect.height():
+            return False
+        self.setGeometry(rect)
+        return True
 
     def paintEvent(self, event):
+        if self.sprites.dpr != self.devicePixelRatioF():
+            self.sprites.dpr = self.devicePixelRatioF()
+            self.sprites.clear()
+            self._prepare_animation()
+        prof = self.profiler
+        if prof or self.governor:
+            t0 = time.perf_counter()
+        animation = self._active_animation()
+        if animation:
+            animation.seek(self.clock())
         painter = QPainter(self)
-        painter.setPen(Qt.PenStyle.NoPen)
-        r, g, b = self.settings["color"]
-        shape, max_size, n = self.settings["shape"], self.settings["max_size"], len(self.dots)
-        for i, dot in enumerate(self.dots):
-            alpha = max(10, int(255 * (1 - i / max(n, 1))))
-            size = max(1, max_size - (i * (max_size / max(n, 1))))
-            draw_shape(painter, shape, dot, size, QColor(r, g, b, alpha), self.pixmap)
+        painter.translate(-self.x(), -self.y())
+        # Particles are scaled fragments; smooth scaling goes with the antialiased tiers
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, self.sprites.antialias)
+        s = self.settings
+        # Past the governor's dot cap every stride-th dot is drawn, so the trail keeps its length and taper
+        stride = self.dot_stride
+        if self.particles:
+            sprite = (animation or self.sprites).get(s.shape, self.particles.extent(s.max_size), s.color, self.pixmap)
+            self.particles.paint(painter, sprite)
+        paint_trail(painter, animation or self.sprites, self.frame[::stride], s, self.pixmap)
+        if self.pointers is not None:
+            p = self.pointers
+            paint_pointers(painter, animation or self.sprites, p.group.view[::stride], p.colors, s, self.pixmap)
+        painter.resetTransform()
+        if self.governor:
+            # A frame is the tick that moved the trail plus this paint; repaints without a tick add only their paint
+            if self.governor.add(self.tick_ms + (time.perf_counter() - t0) * 1000):
+                self._apply_quality()
+            self.tick_ms = 0.0
+        if prof:
+            prof.add(profiler.PAINT, time.perf_counter() - t0)
+            if self.hud:
+                self._paint_hud(painter, prof)
+
+    def _paint_hud(self, painter, prof):
+        painter.setOpacity(1.0)
+        painter.fillRect(HUD_RECT, QColor(15, 22, 16, 200))
+        painter.setPen(QColor(TEXT))
+        painter.setFont(QFont("Consolas", 9))
+        phases = prof.phase_ms()
+        lines = [f"{prof.fps():5.1f} fps  {sum(phases.values()):6.3f} ms"] + [f"{p:<9}{ms:8.3f} ms" for p, ms in phases.items()]
+        painter.drawText(HUD_RECT.adjusted(10, 8, -10, -8), Qt.AlignmentFlag.AlignLeft, "\n".join(lines))
 
 
 class HomePage(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, store, cursor_factory=default_cursor, parent=None):
         super().__init__(parent)
+        self.store = store
+        self.cursor_factory = cursor_factory
         self.overlay = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(40, 60, 40, 40)
@@ -233,7 +612,7 @@ class HomePage(QWidget):
         layout.addSpacing(30)
         
         self.status_card = QFrame()
-        self.status_card.setFixedSize(280, 200)
+        self.status_card.setFixedSize(280, 250)
         self.status_card.setStyleSheet(f"background-color: {CARD_BG}; border-radius: 20px;")
         card_layout = QVBoxLayout(self.status_card)
         card_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -241,7 +620,7 @@ class HomePage(QWidget):
         
         self.status_icon = QLabel()
         self.status_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.status_icon.setPixmap(qta.icon('mdi6.cursor-default-outline', color=TEXT_DIM).pixmap(QSize(64, 64)))
+        self.status_icon.setPixmap(icon_pixmap('mdi6.cursor-default-outline', TEXT_DIM))
         card_layout.addWidget(self.status_icon)
         
         self.status_label = QLabel("Stopped")
@@ -249,6 +628,41 @@ class HomePage(QWidget):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         card_layout.addWidget(self.status_label)
         
+        # Quality tier the frame-budget governor has settled on while the overlay runs
+        self.quality_label = QLabel("")
+        self.quality_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.quality_label.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
+        card_layout.addWidget(self.quality_label)
+        self.feed_label = QLabel("")
+        self.feed_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.feed_label.setWordWrap(True)
+        self.feed_label.setStyleSheet(f"color: {ERROR}; font-size: 11px;")
+        self.feed_label.hide()
+        card_layout.addWidget(self.feed_label)
+        
+        # Frame profiling: record per-phase timings, optionally show them on the overlay, export them
+        self.profiler = None
+        tools = QHBoxLayout()
+        tools.setSpacing(6)
+        small = f"QPushButton {{background-color: {ACCENT}; border-radius: 8px; padding: 6px 8px; font-size: 11px;}} QPushButton:checked {{background-color: {HIGHLIGHT};}}"
+        self.profile_btn = QPushButton(" Profile")
+        self.profile_btn.setIcon(icon('mdi6.timer-outline', TEXT))
+        self.profile_btn.setCheckable(True)
+        self.profile_btn.toggled.connect(self.toggle_profiling)
+        self.hud_btn = QPushButton(" HUD")
+        self.hud_btn.setIcon(icon('mdi6.monitor-dashboard', TEXT))
+        self.hud_btn.setCheckable(True)
+        self.hud_btn.setEnabled(False)
+        self.hud_btn.toggled.connect(self._attach_profiler)
+        self.export_btn = QPushButton(" Export")
+        self.export_btn.setIcon(icon('mdi6.export', TEXT))
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_profile)
+        for btn in (self.profile_btn, self.hud_btn, self.export_btn):
+            btn.setStyleSheet(small)
+            tools.addWidget(btn)
+        card_layout.addLayout(tools)
+        
         card_container = QHBoxLayout()
         card_container.setAlignment(Qt.AlignmentFlag.AlignCenter)
         card_container.addWidget(self.status_card)
@@ -257,19 +671,11 @@ class HomePage(QWidget):
         layout.addSpacing(30)
         
         self.toggle_btn = QPushButton("  Start")
-        self.toggle_btn.setIcon(qta.icon('mdi6.play', color=TEXT))
+        self.toggle_btn.setIcon(icon('mdi6.play', TEXT))
         self.toggle_btn.setIconSize(QSize(24, 24))
         self.toggle_btn.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
         self.toggle_btn.setFixedSize(200, 60)
-        self.toggle_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {HIGHLIGHT};
-                border-radius: 16px;
-            }}
-            QPushButton:hover {{
-                background-color: #3d5c3d;
-            }}
-        """)
+        self.toggle_btn.setStyleSheet(START_BTN_STYLE)
         self.toggle_btn.clicked.connect(self.toggle_overlay)
         
         btn_container = QHBoxLayout()
@@ -283,29 +689,69 @@ class HomePage(QWidget):
     def toggle_overlay(self):
         if self.is_running:
             if self.overlay:
+                self.store.changed.disconnect(self.overlay.apply_settings)
                 self.overlay.timer.stop()
                 self.overlay.close()
                 self.overlay = None
             self.is_running = False
             self.toggle_btn.setText("  Start")
-            self.toggle_btn.setIcon(qta.icon('mdi6.play', color=TEXT))
-            self.toggle_btn.setStyleSheet(f"QPushButton {{background-color: {HIGHLIGHT}; border-radius: 16px;}} QPushButton:hover {{background-color: #3d5c3d;}}")
+            self.toggle_btn.setIcon(icon('mdi6.play', TEXT))
+            self.toggle_btn.setStyleSheet(START_BTN_STYLE)
             self.status_label.setText("Stopped")
-            self.status_icon.setPixmap(qta.icon('mdi6.cursor-default-outline', color=TEXT_DIM).pixmap(QSize(64, 64)))
+            self.quality_label.setText("")
+            self._show_feed("")
+            self.status_icon.setPixmap(icon_pixmap('mdi6.cursor-default-outline', TEXT_DIM))
         else:
-            self.overlay = Overlay(load_settings())
+            self.overlay = Overlay(self.store.data, self.cursor_factory())
+            self.store.changed.connect(self.overlay.apply_settings)
+            self.overlay.quality_changed.connect(self._show_quality)
+            self._show_quality(self.overlay.quality())
+            self.overlay.feed_changed.connect(self._show_feed)
+            self._show_feed(self.overlay.feed_error or "")
+            self._attach_profiler()
             self.is_running = True
             self.toggle_btn.setText("  Stop")
-            self.toggle_btn.setIcon(qta.icon('mdi6.stop', color=TEXT))
-            self.toggle_btn.setStyleSheet(f"QPushButton {{background-color: {ACCENT}; border-radius: 16px;}} QPushButton:hover {{background-color: #3d5c3d;}}")
+            self.toggle_btn.setIcon(icon('mdi6.stop', TEXT))
+            self.toggle_btn.setStyleSheet(STOP_BTN_STYLE)
             self.status_label.setText("Running")
-            self.status_icon.setPixmap(qta.icon('mdi6.cursor-default', color='#2ecc71').pixmap(QSize(64, 64)))
+            self.status_icon.setPixmap(icon_pixmap('mdi6.cursor-default', '#2ecc71'))
+
+    def _show_quality(self, tier):
+        governed = self.overlay is not None and self.overlay.governor is not None
+        self.quality_label.setText(f"Quality: {tier}" if governed else "Quality: fixed (no frame budget)")
+
+    def _show_feed(self, error):
+        self.feed_label.setText(f"Pointer feed: {error}" if error else "")
+        self.feed_label.setVisible(bool(error))
+
+    def toggle_profiling(self, enabled):
+        # A fresh profiler per session; the last one is kept after stopping so it can still be exported
+        if enabled:
+            self.profiler = profiler.FrameProfiler()
+        self.hud_btn.setEnabled(enabled)
+        self.export_btn.setEnabled(self.profiler is not None)
+        self._attach_profiler()
+
+    def _attach_profiler(self):
+        if self.overlay:
+            enabled = self.profile_btn.isChecked()
+            self.overlay.set_profiler(self.profiler if enabled else None, self.hud_btn.isChecked())
+
+    def export_profile(self):
+        path, chosen = QFileDialog.getSaveFileName(self, "Export Frame Timings", "frame_timings.csv", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        if path.lower().endswith(".json") or (chosen.startswith("JSON") and not path.lower().endswith(".csv")):
+            self.profiler.export_json(path)
+        else:
+            self.profiler.export_csv(path)
 
 
 class SettingsPage(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, store, shape_folder=None, parent=None):
         super().__init__(parent)
-        self.s = load_settings()
+        self.store = store
+        self.s = store.data
         layout = QVBoxLayout(self)
         layout.setContentsMargins(40, 30, 40, 30)
         layout.setSpacing(16)
@@ -317,7 +763,7 @@ class SettingsPage(QWidget):
         layout.addWidget(title)
         layout.addSpacing(10)
         
-        fields = [("Dots", "num_dots"), ("Follow Speed", "follow_speed"), ("Lag Speed", "lag_speed"), ("Max Size", "max_size")]
+        fields = [("Dots", "num_dots"), ("Follow Speed", "follow_speed"), ("Lag Speed", "lag_speed"), ("Max Size", "max_size"), ("Sample Hz", "sample_hz"), ("Frame Budget ms", "frame_budget_ms"), ("Pointer Feed", "pointer_feed")]
         self.inputs = {}
         for label, key in fields:
             row = QHBoxLayout()
@@ -325,7 +771,7 @@ class SettingsPage(QWidget):
             lbl = QLabel(label)
             lbl.setFont(QFont("Segoe UI", 12))
             lbl.setFixedWidth(120)
-            inp = QLineEdit(str(self.s[key]))
+            inp = QLineEdit(str(getattr(self.s, key)))
             inp.setFixedSize(180, 40)
             self.inputs[key] = inp
             row.addWidget(lbl)
@@ -339,55 +785,50 @@ class SettingsPage(QWidget):
         lbl.setFixedWidth(120)
         self.shape_dropdown = QComboBox()
         self.shape_dropdown.setFixedSize(180, 40)
-        shapes = ["Circle", "Square", "Diamond", "Triangle", "Star", "Hexagon", "Pentagon", "Heart", "Cross", "Crescent", "Oval", "Arrow", "Mouse", "Image"]
-        self.shape_dropdown.addItems(shapes)
-        self.shape_dropdown.setCurrentText(self.s["shape"])
+        self.shape_dropdown.addItems(SHAPES)
+        self.shape_dropdown.setCurrentText(self.s.shape)
         row.addWidget(lbl)
         row.addWidget(self.shape_dropdown)
         layout.addLayout(row)
         
-        # Color picker row with preview
+        self.dropdowns = {}
+        self._dropdown(layout, "Trail", "trail_mode", TRAIL_MODES)
+        self._dropdown(layout, "Effect", "effect", EFFECTS)
+        
         row = QHBoxLayout()
         row.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        lbl = QLabel("Color")
+        lbl = QLabel("Window")
         lbl.setFont(QFont("Segoe UI", 12))
         lbl.setFixedWidth(120)
-        
-        color_container = QHBoxLayout()
-        color_container.setSpacing(10)
-        
-        # Color preview box
-        self.color_preview = QFrame()
-        self.color_preview.setFixedSize(40, 40)
-        r, g, b = self.s["color"]
-        self.color_preview.setStyleSheet(f"background-color: rgb({r},{g},{b}); border-radius: 8px; border: 2px solid {ACCENT};")
-        
-        self.color_btn = QPushButton("  Pick Color   ")
-        self.color_btn.setIcon(qta.icon('mdi6.palette', color=TEXT))
-        self.color_btn.setFixedSize(130, 40)
-        self.color_btn.clicked.connect(self.pick_color)
-        
-        color_container.addWidget(self.color_preview)
-        color_container.addWidget(self.color_btn)
-        
+        self.window_dropdown = QComboBox()
+        self.window_dropdown.setFixedSize(180, 40)
+        self.window_dropdown.addItems(WINDOW_MODES)
+        self.window_dropdown.setCurrentText(self.s.window_mode)
         row.addWidget(lbl)
-        row.addLayout(color_container)
+        row.addWidget(self.window_dropdown)
         layout.addLayout(row)
         
+        self.color_previews = {}
+        self._color_row(layout, "Color", "color")
+        self._dropdown(layout, "Colors", "color_mode", COLOR_MODES)
+        self._color_row(layout, "End Color", "color_end")
+        self._dropdown(layout, "Size Falloff", "size_easing", EASINGS)
+        self._dropdown(layout, "Fade Falloff", "opacity_easing", EASINGS)
+        
         row = QHBoxLayout()
         row.setAlignment(Qt.AlignmentFlag.AlignCenter)
         lbl = QLabel("Image")
         lbl.setFont(QFont("Segoe UI", 12))
         lbl.setFixedWidth(120)
         img_btn = QPushButton("  Choose Image")
-        img_btn.setIcon(qta.icon('mdi6.image', color=TEXT))
+        img_btn.setIcon(icon('mdi6.image', TEXT))
         img_btn.setFixedSize(180, 40)
         img_btn.clicked.connect(self.pick_image)
         row.addWidget(lbl)
         row.addWidget(img_btn)
         layout.addLayout(row)
         
-        self.image_label = QLabel(self.s.get("image_path", "") or "No image selected")
+        self.image_label = QLabel(self.s.image_path or "No image selected")
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.image_label.setStyleSheet(f"color: {TEXT_DIM}; font-size: 11px;")
         layout.addWidget(self.image_label)
@@ -395,7 +836,7 @@ class SettingsPage(QWidget):
         layout.addSpacing(15)
         
         save_btn = QPushButton("  Save Settings")
-        save_btn.setIcon(qta.icon('mdi6.content-save', color=TEXT))
+        save_btn.setIcon(icon('mdi6.content-save', TEXT))
         save_btn.setIconSize(QSize(20, 20))
         save_btn.setFixedSize(200, 50)
         save_btn.setStyleSheet(f"QPushButton {{background-color: {HIGHLIGHT}; border-radius: 12px;}} QPushButton:hover {{background-color: #3d5c3d;}}")
@@ -407,44 +848,124 @@ class SettingsPage(QWidget):
         layout.addLayout(btn_container)
         
         layout.addStretch()
+        self.store.changed.connect(self._sync)
+        if shape_folder:
+            shape_folder.changed.connect(self._shapes_changed)
 
-    def pick_color(self):
-        # Get current color
-        r, g, b = self.s["color"]
-        current = QColor(r, g, b)
-        
-        # Open color dialog with current color
-        color = QColorDialog.getColor(current, self, "Choose Trail Color")
-        
-        if color.isValid():
-            self.s["color"] = [color.red(), color.green(), color.blue()]
-            # Update preview
-            self.color_preview.setStyleSheet(f"background-color: rgb({color.red()},{color.green()},{color.blue()}); border-radius: 8px; border: 2px solid {ACCENT};")
-            # Save immediately so overlay updates in real-time
-            save_settings(self.s)
+    def _sync(self, s):
+        # Keep the form in step with edits made to settings.json outside the app
+        if s == self.s:
+            return
+        self.s = s
+        for key, inp in self.inputs.items():
+            inp.setText(str(getattr(s, key)))
+            inp.setStyleSheet("")
+        self.shape_dropdown.setCurrentText(s.shape)
+        self.window_dropdown.setCurrentText(s.window_mode)
+        for key, dropdown in self.dropdowns.items():
+            dropdown.setCurrentText(getattr(s, key))
+        for key in self.color_previews:
+            self._show_color(key)
+        self.image_label.setText(s.image_path or "No image selected")
+
+    def _shapes_changed(self):
+        self.shape_dropdown.clear()
+        self.shape_dropdown.addItems(SHAPES)
+        self.shape_dropdown.setCurrentText(self.s.shape)
+
+    def _dropdown(self, layout, label, key, items):
+        row = QHBoxLayout()
+        row.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        lbl = QLabel(label)
+        lbl.setFont(QFont("Segoe UI", 12))
+        lbl.setFixedWidth(120)
+        dropdown = QComboBox()
+        dropdown.setFixedSize(180, 40)
+        dropdown.addItems(items)
+        dropdown.setCurrentText(getattr(self.s, key))
+        row.addWidget(lbl)
+        row.addWidget(dropdown)
+        layout.addLayout(row)
+        self.dropdowns[key] = dropdown
+
+    def _color_row(self, layout, label, key):
+        # Color picker row with preview
+        row = QHBoxLayout()
+        row.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        lbl = QLabel(label)
+        lbl.setFont(QFont("Segoe UI", 12))
+        lbl.setFixedWidth(120)
+        color_container = QHBoxLayout()
+        color_container.setSpacing(10)
+        preview = QFrame()
+        preview.setFixedSize(40, 40)
+        self.color_previews[key] = preview
+        self._show_color(key)
+        btn = QPushButton("  Pick Color   ")
+        btn.setIcon(icon('mdi6.palette', TEXT))
+        btn.setFixedSize(130, 40)
+        btn.clicked.connect(lambda: self.pick_color(key))
+        color_container.addWidget(preview)
+        color_container.addWidget(btn)
+        row.addWidget(lbl)
+        row.addLayout(color_container)
+        layout.addLayout(row)
+
+    def _show_color(self, key):
+        r, g, b = getattr(self.s, key)
+        self.color_previews[key].setStyleSheet(f"background-color: rgb({r},{g},{b}); border-radius: 8px; border: 2px solid {ACCENT};")
+
+    def _set_color(self, key, color):
+        self.s = self.s.replace(**{key: (color.red(), color.green(), color.blue())})
+        self._show_color(key)
+        self.store.update(self.s)
+
+    def pick_color(self, key="color"):
+        # The overlay follows the dialog live while the user drags; the store coalesces the writes
+        original = getattr(self.s, key)
+        dialog = QColorDialog(QColor(*original), self)
+        dialog.setWindowTitle("Choose Trail Color")
+        dialog.currentColorChanged.connect(lambda color: self._set_color(key, color))
+        if dialog.exec():
+            self._set_color(key, dialog.selectedColor())
+        elif getattr(self.s, key) != original:
+            self._set_color(key, QColor(*original))
 
     def pick_image(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.bmp *.gif *.webp)")
         if path:
-            self.s["image_path"] = path
+            self.s = self.s.replace(image_path=path)
             self.image_label.setText(path)
-            save_settings(self.s)
+            self.store.update(self.s)
 
     def save_all(self):
-        self.s["num_dots"] = int(self.inputs["num_dots"].text())
-        self.s["follow_speed"] = float(self.inputs["follow_speed"].text())
-        self.s["lag_speed"] = float(self.inputs["lag_speed"].text())
-        self.s["max_size"] = float(self.inputs["max_size"].text())
-        self.s["shape"] = self.shape_dropdown.currentText()
-        save_settings(self.s)
+        # An unreadable entry is outlined and keeps its old value; out-of-range ones are clamped and shown clamped
+        changes = {"shape": self.shape_dropdown.currentText(), "window_mode": self.window_dropdown.currentText()}
+        changes.update((key, dropdown.currentText()) for key, dropdown in self.dropdowns.items())
+        for key, inp in self.inputs.items():
+            try:
+                value = config.coerce(key, inp.text())
+                if key == "pointer_feed" and value:
+                    pointers.parse_address(value)
+                changes[key] = value
+            except ValueError as e:
+                inp.setStyleSheet(INPUT_ERROR_STYLE)
+                inp.setToolTip(str(e))
+                continue
+            inp.setStyleSheet("")
+            inp.setToolTip("")
+        self.s = self.s.replace(**changes)
+        for key in changes.keys() & self.inputs.keys():
+            self.inputs[key].setText(str(getattr(self.s, key)))
+        self.store.update(self.s)
 
 
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, cursor_factory=default_cursor):
         super().__init__()
         self.setWindowTitle("Mouse Follower")
         self.setWindowIcon(QIcon(get_icon_path()))
-        self.resize(450, 700)
+        self.resize(450, 760)
         self.setStyleSheet(STYLE)
         
         layout = QVBoxLayout(self)
@@ -460,15 +981,15 @@ class MainWindow(QWidget):
         nav_layout.setSpacing(40)
         
         self.home_btn = QPushButton("  Home")
-        self.home_btn.setIcon(qta.icon('mdi6.home', color=HIGHLIGHT))
+        self.home_btn.setIcon(icon('mdi6.home', HIGHLIGHT))
         self.home_btn.setIconSize(QSize(22, 22))
-        self.home_btn.setStyleSheet(f"background: transparent; color: {HIGHLIGHT}; font-size: 15px; font-weight: bold;")
+        self.home_btn.setStyleSheet(NAV_ACTIVE_STYLE)
         self.home_btn.clicked.connect(lambda: self.switch_page(0))
         
         self.settings_btn = QPushButton("  Settings")
-        self.settings_btn.setIcon(qta.icon('mdi6.cog', color=TEXT_DIM))
+        self.settings_btn.setIcon(icon('mdi6.cog', TEXT_DIM))
         self.settings_btn.setIconSize(QSize(22, 22))
-        self.settings_btn.setStyleSheet(f"background: transparent; color: {TEXT_DIM}; font-size: 15px; font-weight: bold;")
+        self.settings_btn.setStyleSheet(NAV_IDLE_STYLE)
         self.settings_btn.clicked.connect(lambda: self.switch_page(1))
         
         nav_layout.addWidget(self.home_btn)
@@ -476,29 +997,63 @@ class MainWindow(QWidget):
         
         layout.addWidget(nav)
         
+        self.store = SettingsStore()
+        self.shape_folder = ShapeFolder()
+        self.shape_folder.changed.connect(self.store.refresh)
         self.stack = QStackedWidget()
-        self.home_page = HomePage()
-        self.settings_page = SettingsPage()
+        self.home_page = HomePage(self.store, cursor_factory)
+        # Built on first visit so startup only pays for the page that is shown
+        self.settings_page = None
         self.stack.addWidget(self.home_page)
-        self.stack.addWidget(self.settings_page)
         layout.addWidget(self.stack)
 
     def switch_page(self, index):
+        if index == self.stack.currentIndex():
+            return
+        if index == 1 and self.settings_page is None:
+            self.settings_page = SettingsPage(self.store, self.shape_folder)
+            # The form is taller than the window; it scrolls rather than growing the window with every option
+            scroll = QScrollArea()
+            scroll.setWidgetResizable(True)
+            scroll.setFrameShape(QFrame.Shape.NoFrame)
+            scroll.setWidget(self.settings_page)
+            self.stack.addWidget(scroll)
         self.stack.setCurrentIndex(index)
-        if index == 0:
-            self.home_btn.setIcon(qta.icon('mdi6.home', color=HIGHLIGHT))
-            self.home_btn.setStyleSheet(f"background: transparent; color: {HIGHLIGHT}; font-size: 15px; font-weight: bold;")
-            self.settings_btn.setIcon(qta.icon('mdi6.cog', color=TEXT_DIM))
-            self.settings_btn.setStyleSheet(f"background: transparent; color: {TEXT_DIM}; font-size: 15px; font-weight: bold;")
-        else:
-            self.home_btn.setIcon(qta.icon('mdi6.home', color=TEXT_DIM))
-            self.home_btn.setStyleSheet(f"background: transparent; color: {TEXT_DIM}; font-size: 15px; font-weight: bold;")
-            self.settings_btn.setIcon(qta.icon('mdi6.cog', color=HIGHLIGHT))
-            self.settings_btn.setStyleSheet(f"background: transparent; color: {HIGHLIGHT}; font-size: 15px; font-weight: bold;")
+        home, settings = (HIGHLIGHT, TEXT_DIM) if index == 0 else (TEXT_DIM, HIGHLIGHT)
+        self.home_btn.setIcon(icon('mdi6.home', home))
+        self.home_btn.setStyleSheet(NAV_ACTIVE_STYLE if index == 0 else NAV_IDLE_STYLE)
+        self.settings_btn.setIcon(icon('mdi6.cog', settings))
+        self.settings_btn.setStyleSheet(NAV_IDLE_STYLE if index == 0 else NAV_ACTIVE_STYLE)
+
+
+def session_path(path, session):
+    # The first session records to path itself, later ones to path-2, path-3, ... so none overwrites another
+    if session == 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{session}{ext}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mouse Follower")
+    parser.add_argument("--record", metavar="TRACE",
+                        help="write the cursor movement of each overlay session to a trace file; sessions after the first get -2, -3, ... before the extension")
+    parser.add_argument("--replay", metavar="TRACE", help="drive the overlay from a recorded trace instead of the real cursor")
+    args, qt_args = parser.parse_known_args()
+    if args.replay:
+        cursor_factory = lambda: ReplayCursor(args.replay, loop=True)
+    elif args.record:
+        sessions = itertools.count(1)
+        cursor_factory = lambda: TraceRecorder(default_cursor(), session_path(args.record, next(sessions)))
+    else:
+        cursor_factory = default_cursor
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setWindowIcon(QIcon(get_icon_path()))
+    window = MainWindow(cursor_factory)
+    app.aboutToQuit.connect(window.store.flush)
+    window.show()
+    sys.exit(app.exec())
 
 
-app = QApplication(sys.argv)
-app.setWindowIcon(QIcon(get_icon_path()))
-window = MainWindow()
-window.show()
-sys.exit(app.exec())
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import math
+import numpy as np
+from PyQt6 import sip
+from PyQt6.QtGui import QPainter
+from trail import bounds
+
+PARTICLE_CAPACITY = 16384
+# Per effect: particles per px the trail head travels, lifetime (s), launch speed (px/s), share of the head's
+# velocity passed on, gravity (px/s², negative rises), drag (1/s), size range as a fraction of max_size, tumble (rad/s)
+PRESETS = {
+    "Sparks": {"rate": 0.4, "life": 0.45, "speed": 260.0, "inherit": 0.1, "gravity": 900.0, "drag": 2.5, "size": (0.1, 0.25), "tumble": 0.0},
+    "Dust": {"rate": 0.25, "life": 1.2, "speed": 35.0, "inherit": 0.05, "gravity": -25.0, "drag": 1.5, "size": (0.1, 0.3), "tumble": 0.0},
+    "Confetti": {"rate": 0.12, "life": 1.6, "speed": 180.0, "inherit": 0.2, "gravity": 320.0, "drag": 2.0, "size": (0.2, 0.4), "tumble": 9.0},
+}
+
+
+class ParticleSystem:
+    # Every particle lives in fixed, preallocated arrays; free slots are a stack that emit pops and cull pushes,
+    # so emitting, integrating and culling are each one batched numpy pass and nothing is allocated per particle
+    def __init__(self, effect, capacity=PARTICLE_CAPACITY, seed=None):
+        self.preset = PRESETS[effect]
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.age = np.zeros(capacity)
+        self.life = np.ones(capacity)
+        self.size = np.zeros(capacity)      # fraction of the largest particle, which the sprite is rendered at
+        self.angle = np.zeros(capacity)
+        self.alive = np.zeros(capacity, bool)
+        self.free = np.arange(capacity)
+        self.free_count = capacity
+        self.pending = 0.0
+        self.rng = np.random.default_rng(seed)
+        self.noise = np.empty((5, capacity))
+        self.delta = np.empty((capacity, 2))
+        self.expired = np.empty(capacity, bool)
+        # QPainter.PixmapFragment is ten doubles (x, y, source rect, scale x/y, rotation, opacity); numpy writes
+        # them straight into the sip array, so one drawPixmapFragments call paints every particle
+        self.fragments = sip.array(QPainter.PixmapFragment, capacity)
+        self.frame = np.frombuffer(memoryview(self.fragments), np.float64).reshape(capacity, 10)
+
+    def __len__(self):
+        return self.capacity - self.free_count
+
+    def emit(self, x0, y0, x1, y1, dt):
+        # Particles in proportion to how far the head moved, spread along the move; fractions carry over
+        p = self.preset
+        self.pending += math.hypot(x1 - x0, y1 - y0) * p["rate"]
+        k = int(self.pending)
+        self.pending -= k
+        if k and dt > 0:
+            self.spawn(k, x0, y0, x1, y1, (x1 - x0) / dt * p["inherit"], (y1 - y0) / dt * p["inherit"])
+
+    def spawn(self, k, x0, y0, x1, y1, vx=0.0, vy=0.0):
+        k = min(k, self.free_count)
+        if not k:
+            return
+        p = self.preset
+        idx = self.free[self.free_count - k:self.free_count]
+        self.free_count -= k
+        for row in self.noise[:, :k]:
+            self.rng.random(out=row)
+        along, heading, speed, life, size = self.noise[:, :k]
+        self.pos[idx, 0] = x0 + along * (x1 - x0)
+        self.pos[idx, 1] = y0 + along * (y1 - y0)
+        heading *= 2 * math.pi
+        speed *= p["speed"]
+        speed += p["speed"] / 2
+        self.vel[idx, 0] = vx + np.cos(heading) * speed
+        self.vel[idx, 1] = vy + np.sin(heading) * speed
+        self.angle[idx] = heading
+        self.age[idx] = 0.0
+        self.life[idx] = p["life"] * (0.5 + life)
+        lo, hi = p["size"]
+        self.size[idx] = (lo + size * (hi - lo)) / hi
+        self.alive[idx] = True
+
+    def step(self, dt):
+        if not len(self):
+            return
+        p = self.preset
+        self.vel[:, 1] += p["gravity"] * dt
+        self.vel *= math.exp(-p["drag"] * dt)
+        np.multiply(self.vel, dt, out=self.delta)
+        self.pos += self.delta
+        self.age += dt
+        np.greater_equal(self.age, self.life, out=self.expired)
+        self.expired &= self.alive
+        dead = np.flatnonzero(self.expired)
+        self.alive[dead] = False
+        self.free[self.free_count:self.free_count + len(dead)] = dead
+        self.free_count += len(dead)
+
+    def extent(self, max_size):
+        # Largest particle, in px from its centre
+        return max(1, math.ceil(max_size * self.preset["size"][1]))
+
+    def bounds(self, max_size):
+        # Bounds shifted to the corner trail_region expects, for sprites centred on each particle
+        return bounds(self.pos[self.alive], 1) - self.extent(max_size)
+
+    def paint(self, painter, sprite):
+        live = np.flatnonzero(self.alive)
+        m = len(live)
+        if not m or sprite is None:
+            return
+        f = self.frame[:m]
+        f[:, 0:2] = self.pos[live]
+        f[:, 2:4] = 0.0
+        f[:, 4] = sprite.width()
+        f[:, 5] = sprite.height()
+        np.divide(self.size[live], sprite.devicePixelRatio(), out=f[:, 6])
+        f[:, 7] = f[:, 6]
+        if self.preset["tumble"]:
+            # Tumbling is a squash along x; real rotation sends every fragment down the paint engine's slow path
+            tumble = self.angle[live]
+            tumble += self.age[live] * self.preset["tumble"]
+            f[:, 6] *= np.abs(np.cos(tumble))
+        f[:, 8] = 0.0
+        # Fade out over the lifetime
+        np.divide(self.age[live], self.life[live], out=f[:, 9])
+        np.subtract(1.0, f[:, 9], out=f[:, 9])
+        painter.setOpacity(1.0)
+        painter.drawPixmapFragments(self.fragments[:m], sprite)
@@ -0,0 +1,206 @@
+import asyncio, colorsys, os, socket, stat, struct, threading, time
+import numpy as np
+from trail import TrailGroup
+
+# Datagram: magic, then one record per pointer of (pointer id, flags, x, y); a sender may batch many pointers in one
+POINTER_MAGIC = b"MFP1"
+POINTER_RECORD = struct.Struct("<HBii")
+POINTER_LEAVE = 1           # flag: the pointer is gone, drop its trail now rather than after POINTER_TIMEOUT
+POINTER_TIMEOUT = 2.0       # s without an update before a pointer's trail is evicted
+POINTER_CAPACITY = 256      # trails at once; updates for further pointers are dropped until one leaves
+RECEIVE_BYTES = 65536
+GOLDEN_RATIO = 0.618033988749895
+
+
+def encode(records):
+    # records: (pointer id, x, y) or (pointer id, x, y, flags)
+    return POINTER_MAGIC + b"".join(POINTER_RECORD.pack(r[0], r[3] if len(r) > 3 else 0, r[1], r[2]) for r in records)
+
+
+def parse_address(text):
+    # "udp:HOST:PORT" or "unix:PATH"; returns (family, address) for a datagram socket
+    kind, _, rest = text.partition(":")
+    if kind == "udp":
+        host, _, port = rest.rpartition(":")
+        try:
+            return socket.AF_INET, (host or "127.0.0.1", int(port))
+        except ValueError:
+            raise ValueError(f"bad port in {text!r}") from None
+    if kind == "unix" and rest and hasattr(socket, "AF_UNIX"):
+        return socket.AF_UNIX, rest
+    raise ValueError(f"pointer feed address must be udp:HOST:PORT or unix:PATH, not {text!r}")
+
+
+def remove_stale_socket(path):
+    # A socket file left behind by a crashed run is removed before binding; anything else at the path is left alone
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket")
+    os.remove(path)
+
+
+def pointer_color(pid):
+    # Hues a golden-ratio step apart, so any run of ids gets well separated colors
+    r, g, b = colorsys.hsv_to_rgb((pid * GOLDEN_RATIO) % 1.0, 0.75, 1.0)
+    return (round(r * 255), round(g * 255), round(b * 255))
+
+
+class PointerFeed(threading.Thread):
+    # Receives pointer datagrams on an asyncio loop in its own thread. Only the newest position of each pointer is
+    # kept; the GUI thread collects them once a frame with take(), so a burst of packets costs one trail step.
+    def __init__(self, address, clock=time.perf_counter, on_wake=None):
+        super().__init__(name="pointer-feed", daemon=True)
+        self.family, self.address = parse_address(address)
+        self.clock = clock
+        self.on_wake = on_wake
+        self.sleeping = False       # set by the overlay while idle; the next packet calls on_wake once
+        self.lock = threading.Lock()
+        self.latest = {}
+        self.packets = 0
+        self.dropped = 0
+        self.error = None
+        self.bound = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._halt = None
+
+    def start(self):
+        # Returns once the socket is bound; a bind failure is raised here rather than lost in the thread
+        super().start()
+        self._ready.wait()
+        if self.error:
+            self.join()
+            raise self.error
+
+    def stop(self):
+        if self._loop and self.is_alive():
+            self._loop.call_soon_threadsafe(self._halt.set)
+            self.join()
+
+    def run(self):
+        # A selector loop on every platform: Windows' default proactor loop has no add_reader
+        loop = asyncio.SelectorEventLoop()
+        try:
+            loop.run_until_complete(self._serve())
+        except Exception as e:
+            self.error = e
+        finally:
+            loop.close()
+            self._ready.set()       # start() must never wait on a thread that died setting up
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._halt = asyncio.Event()
+        if self.family != socket.AF_INET:
+            remove_stale_socket(self.address)
+        sock = socket.socket(self.family, socket.SOCK_DGRAM)
+        try:
+            sock.bind(self.address)
+            sock.setblocking(False)
+            # A reader callback drains every queued datagram per wake-up; asyncio's datagram transport takes one per
+            # wake-up, which at thousands of packets a second spends most of its time in the selector
+            self._loop.add_reader(sock.fileno(), self._drain, sock)
+        except BaseException:
+            sock.close()
+            raise
+        self.bound = sock.getsockname()
+        self._ready.set()
+        try:
+            await self._halt.wait()
+        finally:
+            self._loop.remove_reader(sock.fileno())
+            sock.close()
+            if self.family != socket.AF_INET:
+                try:
+                    os.remove(self.address)
+                except OSError:
+                    pass
+
+    def _drain(self, sock):
+        while True:
+            try:
+                data = sock.recv(RECEIVE_BYTES)
+            except OSError:
+                # Drained, or an error such as Windows reporting an ICMP port-unreachable; the reader fires again
+                # once more data is queued
+                return
+            self.receive(data)
+
+    def receive(self, data):
+        body = len(data) - len(POINTER_MAGIC)
+        if body <= 0 or body % POINTER_RECORD.size or not data.startswith(POINTER_MAGIC):
+            self.dropped += 1
+            return
+        now = self.clock()
+        with self.lock:
+            for pid, flags, x, y in POINTER_RECORD.iter_unpack(memoryview(data)[len(POINTER_MAGIC):]):
+                self.latest[pid] = (x, y, now, flags & POINTER_LEAVE)
+        self.packets += 1
+        if self.sleeping:
+            self.sleeping = False
+            if self.on_wake:
+                self.on_wake()
+
+    def take(self):
+        # Updates since the last call, as {pointer id: (x, y, time, leaving)}
+        with self.lock:
+            updates, self.latest = self.latest, {}
+        return updates
+
+
+class PointerTrails:
+    # One chase trail per remote pointer, all in a single TrailGroup holding just the connected pointers, so a feed
+    # with nobody on it steps nothing. Trail i belongs to pointer ids[i].
+    def __init__(self, count, capacity=POINTER_CAPACITY, timeout=POINTER_TIMEOUT):
+        self.group = TrailGroup(count)
+        self.capacity = capacity
+        self.timeout = timeout
+        self.ids = []
+        self.index = {}             # pointer id -> trail
+        self.seen = np.zeros(0)
+        self.colors = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resize(self, count):
+        self.group.resize(count)
+
+    def apply(self, updates, now):
+        # Moves targets, then drops pointers that left or went quiet and adds new ones in a single regroup
+        gone, joined = set(), {}
+        for pid, (x, y, t, leaving) in updates.items():
+            i = self.index.get(pid)
+            if leaving:
+                if i is not None:
+                    gone.add(i)
+            elif i is None:
+                joined[pid] = (x, y, t)
+            else:
+                self.group.target[i] = (x, y)
+                self.seen[i] = t
+        gone.update(np.flatnonzero(now - self.seen > self.timeout).tolist())
+        if not gone and not joined:
+            return
+        keep = [i for i in range(len(self.ids)) if i not in gone]
+        joined = list(joined.items())[:self.capacity - len(keep)]
+        self.group.regroup(keep, [(x, y) for _, (x, y, _) in joined])
+        self.seen = np.concatenate((self.seen[keep], [t for _, (_, _, t) in joined]))
+        self.colors = [self.colors[i] for i in keep] + [pointer_color(pid) for pid, _ in joined]
+        self.ids = [self.ids[i] for i in keep] + [pid for pid, _ in joined]
+        self.index = {pid: i for i, pid in enumerate(self.ids)}
+
+    def stale(self, now):
+        return bool((now - self.seen > self.timeout).any())
+
+    def advance(self, follow, lag, dt):
+        self.group.advance_all(follow, lag, dt)
+
+    def settled(self, eps):
+        return self.group.all_settled(eps)
+
+    def bounds(self):
+        return self.group.trail_bounds()
@@ -0,0 +1,59 @@
+import csv, json
+import numpy as np
+
+PHASES = ("cursor", "settings", "physics", "paint")
+CURSOR, SETTINGS, PHYSICS, PAINT = range(len(PHASES))
+PROFILE_FRAMES = 1024
+
+
+class FrameProfiler:
+    # Fixed-size ring of frames; each row is the frame's start time followed by seconds spent in each phase
+    def __init__(self, capacity=PROFILE_FRAMES):
+        self.rows = np.zeros((capacity, 1 + len(PHASES)))
+        self.count = 0
+
+    def begin(self, now):
+        row = self.rows[self.count % len(self.rows)]
+        row[:] = 0.0
+        row[0] = now
+        self.count += 1
+
+    def add(self, phase, seconds):
+        if self.count:
+            self.rows[(self.count - 1) % len(self.rows), 1 + phase] += seconds
+
+    def frames(self):
+        # Recorded rows, oldest first
+        n = len(self.rows)
+        if self.count <= n:
+            return self.rows[:self.count].copy()
+        i = self.count % n
+        return np.concatenate((self.rows[i:], self.rows[:i]))
+
+    def recent(self, window=1.0):
+        rows = self.frames()
+        return rows[rows[:, 0] >= rows[-1, 0] - window] if len(rows) else rows
+
+    def fps(self, window=1.0):
+        rows = self.recent(window)
+        if len(rows) < 2 or rows[-1, 0] <= rows[0, 0]:
+            return 0.0
+        return (len(rows) - 1) / (rows[-1, 0] - rows[0, 0])
+
+    def phase_ms(self, window=1.0):
+        rows = self.recent(window)
+        if not len(rows):
+            return dict.fromkeys(PHASES, 0.0)
+        return dict(zip(PHASES, (rows[:, 1:].mean(axis=0) * 1000).tolist()))
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time"] + [f"{p}_ms" for p in PHASES])
+            for t, *phases in self.frames().tolist():
+                writer.writerow([f"{t:.6f}"] + [f"{ms * 1000:.4f}" for ms in phases])
+
+    def export_json(self, path):
+        frames = [dict(time=t, **{f"{p}_ms": ms * 1000 for p, ms in zip(PHASES, phases)}) for t, *phases in self.frames().tolist()]
+        with open(path, "w") as f:
+            json.dump({"fps": self.fps(), "phase_ms": self.phase_ms(), "frames": frames}, f, indent=4)
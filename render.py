@@ -0,0 +1,122 @@
+import argparse, math, multiprocessing, os, shutil, subprocess, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from cursor import CursorSource, ReplayCursor
+from config import Settings
+import config
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+FRAME_NAME = "frame_{:06d}.png"
+# Qt's PNG quality picks the zlib level; 100 is the fastest, and mostly-empty frames barely grow for it
+PNG_QUALITY = 100
+
+
+class FrameClock:
+    # The renderer's time: frame i is shown at i / fps, however long it takes to draw
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class RenderCursor(CursorSource):
+    # Trace positions shifted into the canvas, so a recording from any monitor lands in frame
+    def __init__(self, replay, dx, dy):
+        self.replay = replay
+        self.dx, self.dy = dx, dy
+
+    def pos(self):
+        x, y = self.replay.pos()
+        return x - self.dx, y - self.dy
+
+
+def render_chunk(job):
+    # Every chunk replays the physics from frame 0 without drawing, so its first frame matches a straight-through
+    # render exactly; fast-forwarding costs microseconds a frame, next to milliseconds for drawing one
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QImage, QColor
+    import overlay, shapes
+    app = QApplication.instance() or QApplication([])
+    shapes.load_shape_dir(overlay.SHAPE_DIR)
+    clock = FrameClock()
+    cursor = RenderCursor(ReplayCursor(job["trace"], clock=clock), *job["offset"])
+    ov = overlay.Overlay(Settings.from_dict(job["settings"]), cursor, clock, seed=0)
+    ov.timer.stop()
+    ov.setGeometry(0, 0, job["width"], job["height"])
+    image = QImage(job["width"], job["height"], QImage.Format.Format_ARGB32_Premultiplied)
+    background = QColor(job["background"]) if job["background"] else QColor(0, 0, 0, 0)
+    fps = job["fps"]
+    for i in range(job["stop"]):
+        clock.t = i / fps
+        ov.update_overlay()
+        if i < job["start"]:
+            continue
+        image.fill(background)
+        ov.render(image)
+        path = os.path.join(job["out"], FRAME_NAME.format(i))
+        if not image.save(path, "PNG", PNG_QUALITY):
+            raise OSError(f"could not write {path}")
+    ov.close()
+    return job["start"], job["stop"]
+
+
+def ffmpeg_pipe(path, fps, extra):
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        sys.exit("ffmpeg not found on PATH; drop --ffmpeg to keep just the PNG sequence")
+    args = [ffmpeg, "-y", "-loglevel", "error", "-f", "image2pipe", "-c:v", "png", "-framerate", f"{fps:g}", "-i", "-"]
+    return subprocess.Popen(args + (extra or []) + [path], stdin=subprocess.PIPE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a cursor trace with the Mouse Follower trail, headless, to PNG frames or video")
+    parser.add_argument("trace", help="cursor trace recorded with overlay.py --record or bench.py trace")
+    parser.add_argument("--settings", help="settings.json to render with (defaults otherwise)")
+    parser.add_argument("--out", default="frames", help="directory for the PNG sequence")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--offset", type=int, nargs=2, default=[0, 0], metavar=("X", "Y"),
+                        help="screen position of the canvas's top-left corner in the trace")
+    parser.add_argument("--background", help="fill color, e.g. #101010; transparent otherwise")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="render processes")
+    parser.add_argument("--chunk", type=int, help="frames per chunk (defaults to an even split, four chunks per process)")
+    parser.add_argument("--ffmpeg", metavar="VIDEO", help="also pipe the frames, in order, into ffmpeg writing VIDEO")
+    parser.add_argument("--ffmpeg-args", nargs=argparse.REMAINDER, help="extra ffmpeg output options, e.g. -c:v libx264 -pix_fmt yuv420p")
+    args = parser.parse_args()
+
+    settings = config.read(args.settings) if args.settings else Settings()
+    # Rendering is driven frame by frame from this process's clock: no worker thread, a fixed canvas, no governor
+    # trading quality for wall-clock frame time, and no live remote pointers (nor a socket bound per process)
+    settings = settings.replace(sample_hz=0, window_mode="Full Screen", frame_budget_ms=0, pointer_feed="")
+    duration = ReplayCursor(args.trace, clock=lambda: 0.0).duration
+    frames = math.floor(duration * args.fps) + 1
+    jobs = max(1, args.jobs or 1)
+    chunk = args.chunk or max(1, math.ceil(frames / (jobs * 4)))
+    os.makedirs(args.out, exist_ok=True)
+    job = {"trace": args.trace, "settings": settings.to_dict(), "fps": args.fps, "width": args.width, "height": args.height,
+           "offset": args.offset, "background": args.background, "out": args.out}
+    chunks = [dict(job, start=start, stop=min(start + chunk, frames)) for start in range(0, frames, chunk)]
+    video = ffmpeg_pipe(args.ffmpeg, args.fps, args.ffmpeg_args) if args.ffmpeg else None
+    print(f"{frames} frames ({duration:.2f} s at {args.fps:g} fps, {args.width}x{args.height}) in {len(chunks)} chunks on {jobs} processes")
+    t0 = time.perf_counter()
+    # Spawned, not forked, so no process inherits Qt state; chunks come back in order for the ffmpeg pipe
+    with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for start, stop in pool.map(render_chunk, chunks):
+            if video:
+                for i in range(start, stop):
+                    with open(os.path.join(args.out, FRAME_NAME.format(i)), "rb") as f:
+                        video.stdin.write(f.read())
+            print(f"\r{stop}/{frames} frames", end="", flush=True)
+    elapsed = time.perf_counter() - t0
+    print(f"\nrendered in {elapsed:.1f} s, {frames / elapsed:.1f} frames/s")
+    if video:
+        video.stdin.close()
+        if video.wait():
+            sys.exit("ffmpeg failed")
+        print(f"wrote {args.ffmpeg}")
+
+
+if __name__ == "__main__":
+    main()
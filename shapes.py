@@ -0,0 +1,366 @@
+import math, bisect, functools, os
+from collections import OrderedDict
+from PyQt6.QtGui import QPainter, QColor, QBrush, QPolygonF, QPixmap, QPainterPath, QRegion, QImageReader, QTransform
+from PyQt6.QtCore import Qt, QPointF, QRectF, QRect
+import config
+
+# Sprites keep a transparent border so edge pixels of the rasterized shape are never clipped
+SPRITE_PAD = 1
+SPRITE_CACHE_BYTES = 16 * 1024 * 1024
+ANIMATION_CACHE_BYTES = 64 * 1024 * 1024
+# GIFs often declare 0 ms frames; browsers clamp those too
+MIN_FRAME_DELAY_MS = 20
+
+# Falloff along the trail for size and opacity: t runs from 0 at the lead dot towards 1 at the tail
+EASINGS = {
+    "Linear": lambda t: t,
+    "Ease In": lambda t: t * t,
+    "Ease Out": lambda t: 1 - (1 - t) ** 2,
+    "Ease In Out": lambda t: t * t * (3 - 2 * t),
+    "None": lambda t: 0.0,
+}
+PALETTES = {
+    "Rainbow": [(255, 0, 0), (255, 160, 0), (255, 255, 0), (0, 220, 0), (0, 160, 255), (90, 0, 255), (200, 0, 255)],
+    "Fire": [(255, 255, 180), (255, 200, 0), (255, 90, 0), (180, 0, 0)],
+    "Ocean": [(180, 255, 255), (0, 200, 255), (0, 90, 200), (0, 30, 90)],
+}
+# Every name the settings accept must have a curve or palette here, or style_table would fail at paint time
+assert set(EASINGS) == set(config.EASINGS), "shapes.EASINGS out of step with config.EASINGS"
+assert set(PALETTES) == set(config.PALETTES), "shapes.PALETTES out of step with config.PALETTES"
+# Colors along a gradient are snapped to this many steps so a long trail needs few distinct sprites
+GRADIENT_STEPS = 64
+
+def _polygon(points):
+    path = QPainterPath()
+    path.addPolygon(QPolygonF([QPointF(x, y) for x, y in points]))
+    path.closeSubpath()
+    return path
+
+
+def _radial(count, radius, start):
+    # Regular polygon around the centre of the unit box; radius may be a function of the vertex index
+    return _polygon([(1 + radius(i) * math.cos(start + i * 2 * math.pi / count), 1 + radius(i) * math.sin(start + i * 2 * math.pi / count))
+                     for i in range(count)])
+
+
+def _ellipse(rect):
+    path = QPainterPath()
+    path.addEllipse(rect)
+    return path
+
+
+def _heart():
+    points = []
+    for i in range(100):
+        t = i * 2 * math.pi / 100
+        hx = 16 * math.sin(t) ** 3
+        hy = -(13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t))
+        points.append((1 + hx / 17, 1 + hy / 17))
+    return _polygon(points)
+
+
+def _cross(w=1 / 3):
+    return _polygon([(1 - w, 0), (1 + w, 0), (1 + w, 1 - w), (2, 1 - w), (2, 1 + w), (1 + w, 1 + w), (1 + w, 2), (1 - w, 2),
+                     (1 - w, 1 + w), (0, 1 + w), (0, 1 - w), (1 - w, 1 - w)])
+
+
+# Every shape is one path in unit space, built once: a dot of size s at (x, y) is the path scaled by s and moved to
+# (x, y), so it covers the box from (x, y) to (x + 2s, y + 2s). Drawing is a dict lookup plus a transform at any size.
+SHAPE_PATHS = {
+    "Circle": _ellipse(QRectF(0, 0, 2, 2)),
+    "Square": _polygon([(0, 0), (2, 0), (2, 2), (0, 2)]),
+    "Diamond": _polygon([(1, 0), (2, 1), (1, 2), (0, 1)]),
+    "Triangle": _polygon([(1, 0), (2, 2), (0, 2)]),
+    "Star": _radial(10, lambda i: 1 if i % 2 == 0 else 0.5, -math.pi / 2),
+    "Hexagon": _radial(6, lambda i: 1, 0),
+    "Pentagon": _radial(5, lambda i: 1, -math.pi / 2),
+    "Heart": _heart(),
+    "Cross": _cross(),
+    "Crescent": _ellipse(QRectF(0, 0, 2, 2)).subtracted(_ellipse(QRectF(0.7, 0, 1.8, 2))),
+    "Oval": _ellipse(QRectF(0, 0, 2, 1)),
+    "Arrow": _polygon([(1, 0), (2, 1), (1.5, 1), (1.5, 2), (0.5, 2), (0.5, 1), (0, 1)]),
+    "Mouse": _polygon([(0, 0), (0, 1.6), (0.3, 1.25), (0.5, 1.7), (0.75, 1.55), (0.5, 1.1), (1.0, 1.1)]),
+}
+BUILTIN_SHAPES = list(SHAPE_PATHS)
+# Shapes for the dropdown, kept in step with SHAPE_PATHS; user shapes sit between the built-ins and Image
+SHAPES = BUILTIN_SHAPES + ["Image"]
+# Loaded user SVGs by file path, with the (mtime, size) they were read at, so a rescan only parses what changed
+_svg_files = {}
+
+
+def register_shape(name, path):
+    # Scales and centres a path of any size into the unit box; a name already registered is redrawn
+    box = path.boundingRect()
+    scale = 2 / max(box.width(), box.height())
+    unit = QTransform.fromTranslate(-box.center().x(), -box.center().y()) * QTransform.fromScale(scale, scale) * QTransform.fromTranslate(1, 1)
+    SHAPE_PATHS[name] = unit.map(path)
+    if name not in SHAPES:
+        SHAPES.insert(len(SHAPES) - 1, name)
+
+
+def unregister_shape(name):
+    if name in BUILTIN_SHAPES:
+        return
+    SHAPE_PATHS.pop(name, None)
+    if name in SHAPES:
+        SHAPES.remove(name)
+
+
+def load_shape_dir(folder):
+    # Every *.svg in folder becomes a shape named after its file; files that are gone are dropped and unreadable ones
+    # skipped. Returns whether any shape was added, redrawn or removed.
+    try:
+        entries = sorted(e for e in os.listdir(folder) if e.lower().endswith(".svg"))
+    except OSError:
+        entries = []
+    changed = False
+    seen = set()
+    for entry in entries:
+        name, file = os.path.splitext(entry)[0], os.path.join(folder, entry)
+        if name in BUILTIN_SHAPES or name == "Image" or name in seen:
+            continue
+        try:
+            st = os.stat(file)
+        except OSError:
+            continue
+        seen.add(name)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if _svg_files.get(file, (None,))[0] == stamp and name in SHAPE_PATHS:
+            continue
+        import svgpath      # only when there is an SVG to read, which keeps the XML parser off startup
+        try:
+            path = svgpath.load(file)
+        except (OSError, ValueError):
+            if _svg_files.pop(file, None):
+                unregister_shape(name)
+                changed = True
+            continue
+        _svg_files[file] = (stamp, name)
+        register_shape(name, path)
+        changed = True
+    for file, (stamp, name) in list(_svg_files.items()):
+        if name not in seen or os.path.dirname(file) != folder:
+            del _svg_files[file]
+            unregister_shape(name)
+            changed = True
+    return changed
+
+
+def draw_shape(painter, shape, x, y, size, color, pixmap=None):
+    painter.setBrush(QBrush(color))
+    size = max(1, int(size))
+
+    if shape == "Image":
+        if pixmap and not pixmap.isNull():
+            scaled = pixmap.scaled(size * 2, size * 2, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            painter.setOpacity(color.alphaF())
+            painter.drawPixmap(int(x), int(y), scaled)
+            painter.setOpacity(1.0)
+        return
+    # A shape that is no longer registered, e.g. a deleted SVG still named in settings.json, draws as a circle
+    path = SHAPE_PATHS.get(shape)
+    if path is None:
+        path = SHAPE_PATHS["Circle"]
+    painter.save()
+    painter.translate(x, y)
+    painter.scale(size, size)
+    painter.drawPath(path)
+    painter.restore()
+
+
+class SpriteCache:
+    # Each (shape, size, color) is rasterized once at full opacity; callers blit it with painter.setOpacity
+    def __init__(self, max_bytes=SPRITE_CACHE_BYTES, dpr=1.0, antialias=True):
+        self.base_bytes = max_bytes
+        self.max_bytes = max_bytes
+        self.dpr = dpr
+        self.antialias = antialias      # changed only together with clear()
+        self.bytes = 0
+        self.sprites = OrderedDict()
+        self.working = {}               # painter name -> (styles, colors, dpr, bytes) of what it draws each frame
+
+    def fit(self, name, styles, colors=1):
+        # Grows the budget to hold every sprite a frame draws, with base_bytes to spare. Below that an LRU cache evicts
+        # each sprite just before it is needed again, so a large max_size (or HiDPI) would re-rasterize every dot
+        # every frame. styles comes from style_table, so the same tuple object means nothing changed.
+        held = self.working.get(name)
+        if held and held[0] is styles and held[1:3] == (colors, self.dpr):
+            return
+        need = colors * sum(sprite_side(size, self.dpr) ** 2 * 4 for size, _ in {(size, c) for size, _, c in styles})
+        self.working[name] = (styles, colors, self.dpr, need)
+        self.max_bytes = self.base_bytes + sum(w[3] for w in self.working.values())
+
+    def clear(self):
+        self.sprites.clear()
+        self.bytes = 0
+
+    def get(self, shape, size, color, pixmap=None):
+        key = (shape, size, None if shape == "Image" else color)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+        if shape == "Image" and (pixmap is None or pixmap.isNull()):
+            return None
+        sprite = self._render(shape, size, color, pixmap)
+        self.sprites[key] = sprite
+        self.bytes += sprite.width() * sprite.height() * 4
+        while self.bytes > self.max_bytes and len(self.sprites) > 1:
+            _, old = self.sprites.popitem(last=False)
+            self.bytes -= old.width() * old.height() * 4
+        return sprite
+
+    def _render(self, shape, size, color, pixmap):
+        return render_sprite(shape, size, color, pixmap, self.dpr, self.antialias)
+
+
+def sprite_side(size, dpr):
+    return math.ceil((size * 2 + SPRITE_PAD * 2) * dpr)
+
+
+def render_sprite(shape, size, color, pixmap=None, dpr=1.0, antialias=True):
+    side = sprite_side(size, dpr)
+    sprite = QPixmap(side, side)
+    sprite.setDevicePixelRatio(dpr)
+    sprite.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(sprite)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, antialias)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, antialias)
+    draw_shape(painter, shape, SPRITE_PAD, SPRITE_PAD, size, QColor(*color), pixmap)
+    painter.end()
+    return sprite
+
+
+class Animation:
+    # An animated GIF/WebP stands in for SpriteCache in paint_trail: prepare() decodes it frame by frame straight into
+    # pre-scaled sprites for the sizes the trail draws, so painting is a lookup and only the sprites stay resident
+    def __init__(self, path):
+        self.path = path
+        self.ends = []
+        self.duration = 0
+        self.min_delay = MIN_FRAME_DELAY_MS
+        self.frame_bytes = 0
+        self.sprites = []
+        self.buckets = {}
+        self.sprite_bytes = 0
+        self.step = 1
+        self.index = 0
+
+    @staticmethod
+    def is_animated(path):
+        reader = QImageReader(path)
+        return reader.supportsAnimation() and reader.imageCount() != 1
+
+    def prepare(self, max_size, max_bytes=ANIMATION_CACHE_BYTES, dpr=1.0):
+        # Size buckets get coarser until every frame at every bucket fits the budget
+        reader = QImageReader(self.path)
+        count = max(1, reader.imageCount())
+        top = max(1, int(max_size))
+        self.step = 1
+        while True:
+            buckets = sorted({min(top, math.ceil(s / self.step) * self.step) for s in range(1, top + 1)})
+            cost = count * sum(sprite_side(b, dpr) ** 2 * 4 for b in buckets)
+            if cost <= max_bytes or self.step >= top:
+                break
+            self.step += 1
+        self.buckets = {s: buckets.index(min(top, math.ceil(s / self.step) * self.step)) for s in range(1, top + 1)}
+        self.sprites, self.ends, self.frame_bytes, t = [], [], 0, 0
+        while True:
+            image = reader.read()
+            if image.isNull():
+                break
+            t += max(reader.nextImageDelay(), MIN_FRAME_DELAY_MS)
+            self.ends.append(t)
+            self.frame_bytes = max(self.frame_bytes, image.width() * image.height() * 4)
+            # One smooth downscale to the largest bucket first keeps the per-bucket scaling cheap
+            side = sprite_side(buckets[-1], dpr)
+            frame = QPixmap.fromImage(image.scaled(side, side, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            self.sprites.append([render_sprite("Image", b, (0, 0, 0), frame, dpr) for b in buckets])
+            if not reader.canRead():
+                break
+        self.duration = t
+        self.min_delay = min((b - a for a, b in zip([0] + self.ends, self.ends)), default=MIN_FRAME_DELAY_MS)
+        self.sprite_bytes = len(self.sprites) * sum(sprite_side(b, dpr) ** 2 * 4 for b in buckets)
+        self.index = min(self.index, max(0, len(self.sprites) - 1))
+
+    def seek(self, seconds):
+        # Returns True when the frame changed
+        if not self.duration:
+            return False
+        index = min(bisect.bisect_right(self.ends, (seconds * 1000) % self.duration), len(self.sprites) - 1)
+        changed, self.index = index != self.index, index
+        return changed
+
+    def fit(self, name, styles, colors=1):
+        # The sprites were budgeted by prepare()
+        pass
+
+    def get(self, shape, size, color, pixmap=None):
+        if not self.sprites:
+            return None
+        return self.sprites[self.index][self.buckets[min(size, len(self.buckets))]]
+
+
+def trail_region(bounds, max_size):
+    # Sprites extend from each dot's position down and to the right, at most 2 * max_size across
+    extent = 2 * math.ceil(max_size) + SPRITE_PAD + 1
+    region = QRegion()
+    for x0, y0, x1, y1 in bounds.tolist():
+        left, top = math.floor(x0) - SPRITE_PAD - 1, math.floor(y0) - SPRITE_PAD - 1
+        rect = QRect(left, top, math.ceil(x1) - left + extent, math.ceil(y1) - top + extent)
+        region = region.united(QRegion(rect))
+    return region
+
+
+def gradient(stops, t):
+    t = round(t * GRADIENT_STEPS) / GRADIENT_STEPS * (len(stops) - 1)
+    i = min(int(t), len(stops) - 2)
+    (r0, g0, b0), (r1, g1, b1), f = stops[i], stops[i + 1], t - i
+    return (round(r0 + (r1 - r0) * f), round(g0 + (g1 - g0) * f), round(b0 + (b1 - b0) * f))
+
+
+@functools.lru_cache(maxsize=16)
+def style_table(n, max_size, color, color_mode, color_end, size_easing, opacity_easing):
+    # (size, opacity, color) for each dot index. It depends only on the settings, so paint_trail looks it up once per
+    # frame instead of redoing the arithmetic and color per dot
+    stops = [color, color_end] if color_mode == "Gradient" else PALETTES.get(color_mode)
+    size_falloff, opacity_falloff = EASINGS[size_easing], EASINGS[opacity_easing]
+    table = []
+    for i in range(n):
+        t = i / n
+        size = max(1, int(max_size - max_size * size_falloff(t)))
+        alpha = max(10, int(255 * (1 - opacity_falloff(t))))
+        table.append((size, alpha / 255, gradient(stops, i / max(n - 1, 1)) if stops else color))
+    return tuple(table)
+
+
+def paint_trail(painter, sprites, pos, settings, pixmap=None):
+    s = settings
+    styles = style_table(len(pos), s.max_size, s.color, s.color_mode, s.color_end, s.size_easing, s.opacity_easing)
+    sprites.fit("trail", styles)
+    shape = s.shape
+    for (x, y), (size, opacity, color) in zip(pos.tolist(), styles):
+        sprite = sprites.get(shape, size, color, pixmap)
+        if sprite is None:
+            continue
+        painter.setOpacity(opacity)
+        painter.drawPixmap(int(x) - SPRITE_PAD, int(y) - SPRITE_PAD, sprite)
+
+
+def paint_pointers(painter, sprites, view, colors, settings, pixmap=None):
+    # Every remote pointer's trail in one pass over the dot index: each index shares a size and opacity across
+    # pointers, so opacity is set once per index rather than per dot. view is (dots, pointers, 2), and a pointer's
+    # color stands in for color_mode.
+    s = settings
+    styles = style_table(len(view), s.max_size, s.color, "Solid", s.color_end, s.size_easing, s.opacity_easing)
+    sprites.fit("pointers", styles, len(colors))
+    if not colors:
+        return
+    shape, get, draw = s.shape, sprites.get, painter.drawPixmap
+    for row, (size, opacity, _) in zip(view.tolist(), styles):
+        painter.setOpacity(opacity)
+        for (x, y), color in zip(row, colors):
+            sprite = get(shape, size, color, pixmap)
+            if sprite is not None:
+                draw(int(x) - SPRITE_PAD, int(y) - SPRITE_PAD, sprite)
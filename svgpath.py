@@ -0,0 +1,255 @@
+import math, re
+import xml.etree.ElementTree as ET
+from PyQt6.QtGui import QPainterPath, QPolygonF, QTransform
+from PyQt6.QtCore import Qt, QPointF, QRectF
+
+# Compiles the filled geometry of an SVG file into one QPainterPath: path, rect, circle, ellipse, polygon and polyline
+# elements under any nesting of groups and transforms. Strokes, text, gradients and <use> are ignored.
+TOKEN = re.compile(r"[MmZzLlHhVvCcSsQqTtAa]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+SKIPPED = {"defs", "clipPath", "mask", "symbol", "marker", "pattern", "style", "title", "desc", "metadata", "text"}
+
+
+def load(path):
+    # Raises ValueError for a file that isn't SVG or has nothing to fill
+    try:
+        root = ET.parse(path).getroot()
+    except ET.ParseError as e:
+        raise ValueError(f"{path}: {e}") from None
+    if _tag(root) != "svg":
+        raise ValueError(f"{path}: not an SVG document")
+    result = QPainterPath()
+    for shape in _walk(root, QTransform(), {"fill": "black", "fill-rule": "nonzero"}):
+        result = result.united(shape)
+    result = result.simplified()
+    box = result.boundingRect()
+    # A zero-area outline (a lone line, say) simplifies away or has no extent to scale into the dot
+    if result.isEmpty() or box.width() <= 0 or box.height() <= 0:
+        raise ValueError(f"{path}: no filled shapes")
+    return result
+
+
+def _tag(element):
+    return element.tag.rpartition("}")[2]
+
+
+def _walk(element, parent, inherited):
+    attrs = dict(element.attrib)
+    for item in attrs.pop("style", "").split(";"):
+        key, _, value = item.partition(":")
+        if value:
+            attrs[key.strip()] = value.strip()
+    style = {key: attrs.get(key, inherited[key]) for key in inherited}
+    transform = _transform(attrs.get("transform", "")) * parent
+    tag = _tag(element)
+    if tag in SKIPPED or attrs.get("display") == "none":
+        return
+    path = _element(tag, attrs)
+    if path is not None and style["fill"] != "none":
+        path.setFillRule(Qt.FillRule.OddEvenFill if style["fill-rule"] == "evenodd" else Qt.FillRule.WindingFill)
+        yield transform.map(path)
+    for child in element:
+        yield from _walk(child, transform, style)
+
+
+def _numbers(text):
+    return [float(n) for n in NUMBER.findall(text)]
+
+
+def _length(attrs, name):
+    # Units are dropped: an icon's geometry is scaled to fit the dot anyway
+    found = NUMBER.match(attrs.get(name, "").strip())
+    return float(found.group()) if found else 0.0
+
+
+def _transform(text):
+    # A transform list applies right to left; QTransform products apply left to right
+    result = QTransform()
+    for name, args in TRANSFORM.findall(text):
+        v = _numbers(args)
+        if name == "matrix" and len(v) == 6:
+            t = QTransform(*v)
+        elif name == "translate" and v:
+            t = QTransform.fromTranslate(v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == "scale" and v:
+            t = QTransform.fromScale(v[0], v[1] if len(v) > 1 else v[0])
+        elif name == "rotate" and v:
+            cx, cy = v[1:3] if len(v) >= 3 else (0.0, 0.0)
+            t = QTransform.fromTranslate(-cx, -cy) * QTransform().rotate(v[0]) * QTransform.fromTranslate(cx, cy)
+        elif name == "skewX" and v:
+            t = QTransform(1, 0, math.tan(math.radians(v[0])), 1, 0, 0)
+        elif name == "skewY" and v:
+            t = QTransform(1, math.tan(math.radians(v[0])), 0, 1, 0, 0)
+        else:
+            continue
+        result = t * result
+    return result
+
+
+def _element(tag, attrs):
+    path = QPainterPath()
+    if tag == "path":
+        return _path_data(attrs.get("d", ""))
+    if tag == "rect":
+        w, h = _length(attrs, "width"), _length(attrs, "height")
+        if w <= 0 or h <= 0:
+            return None
+        rx, ry = _length(attrs, "rx"), _length(attrs, "ry")
+        rx, ry = rx or ry, ry or rx
+        path.addRoundedRect(QRectF(_length(attrs, "x"), _length(attrs, "y"), w, h), min(rx, w / 2), min(ry, h / 2))
+    elif tag in ("circle", "ellipse"):
+        rx = _length(attrs, "r" if tag == "circle" else "rx")
+        ry = rx if tag == "circle" else _length(attrs, "ry")
+        if rx <= 0 or ry <= 0:
+            return None
+        path.addEllipse(QPointF(_length(attrs, "cx"), _length(attrs, "cy")), rx, ry)
+    elif tag in ("polygon", "polyline"):
+        v = _numbers(attrs.get("points", ""))
+        if len(v) < 6:
+            return None
+        path.addPolygon(QPolygonF([QPointF(x, y) for x, y in zip(v[0::2], v[1::2])]))
+        path.closeSubpath()
+    else:
+        return None
+    return path
+
+
+def _path_data(d):
+    # SVG path grammar: a command letter is followed by one or more argument groups, and the letter may be omitted
+    # for repeats (an implicit lineto after a moveto). Lowercase commands are relative to the current point.
+    tokens = TOKEN.findall(d)
+    path = QPainterPath()
+    i, cmd = 0, None
+    x = y = sx = sy = 0.0
+    ctrl = None         # reflected control point for S/T, as (command kind, x, y)
+
+    def take(count):
+        nonlocal i
+        values = [float(t) for t in tokens[i:i + count]]
+        if len(values) < count or any(t.isalpha() for t in tokens[i:i + count]):
+            raise ValueError("truncated path data")
+        i += count
+        return values
+
+    def flag():
+        # Arc flags may be packed against the next number ("a5 5 0 01 10 10")
+        nonlocal i
+        if i >= len(tokens):
+            raise ValueError("truncated path data")
+        t = tokens[i]
+        if t[0] not in "01":
+            raise ValueError("bad arc flag")
+        if len(t) > 1:
+            tokens[i] = t[1:]
+        else:
+            i += 1
+        return t[0] == "1"
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            cmd = tokens[i]
+            i += 1
+        elif cmd is None:
+            raise ValueError("path data must start with a command")
+        rel = cmd.islower()
+        ox, oy = (x, y) if rel else (0.0, 0.0)
+        c = cmd.upper()
+        if c == "Z":
+            path.closeSubpath()
+            x, y = sx, sy
+            cmd = ctrl = None
+            continue
+        if c == "M":
+            px, py = take(2)
+            x, y = sx, sy = ox + px, oy + py
+            path.moveTo(x, y)
+            cmd = "l" if rel else "L"
+            ctrl = None
+        elif c == "L":
+            px, py = take(2)
+            x, y = ox + px, oy + py
+            path.lineTo(x, y)
+            ctrl = None
+        elif c == "H":
+            x = ox + take(1)[0]
+            path.lineTo(x, y)
+            ctrl = None
+        elif c == "V":
+            y = oy + take(1)[0]
+            path.lineTo(x, y)
+            ctrl = None
+        elif c in "CS":
+            if c == "C":
+                x1, y1, x2, y2, px, py = take(6)
+                x1, y1 = ox + x1, oy + y1
+            else:
+                x2, y2, px, py = take(4)
+                x1, y1 = (2 * x - ctrl[1], 2 * y - ctrl[2]) if ctrl and ctrl[0] == "C" else (x, y)
+            x2, y2, x, y = ox + x2, oy + y2, ox + px, oy + py
+            path.cubicTo(x1, y1, x2, y2, x, y)
+            ctrl = ("C", x2, y2)
+        elif c in "QT":
+            if c == "Q":
+                x1, y1, px, py = take(4)
+                x1, y1 = ox + x1, oy + y1
+            else:
+                px, py = take(2)
+                x1, y1 = (2 * x - ctrl[1], 2 * y - ctrl[2]) if ctrl and ctrl[0] == "Q" else (x, y)
+            x, y = ox + px, oy + py
+            path.quadTo(x1, y1, x, y)
+            ctrl = ("Q", x1, y1)
+        elif c == "A":
+            rx, ry, phi = take(3)
+            large, sweep = flag(), flag()
+            px, py = take(2)
+            _arc(path, x, y, abs(rx), abs(ry), phi, large, sweep, ox + px, oy + py)
+            x, y = ox + px, oy + py
+            ctrl = None
+        else:
+            raise ValueError(f"unknown path command {cmd}")
+    return path
+
+
+def _arc(path, x0, y0, rx, ry, phi, large, sweep, x1, y1):
+    # Endpoint to centre parameterisation (SVG spec, appendix F.6.5), then cubic Béziers of at most 90° each
+    if rx == 0 or ry == 0 or (x0, y0) == (x1, y1):
+        path.lineTo(x1, y1)
+        return
+    cos, sin = math.cos(math.radians(phi)), math.sin(math.radians(phi))
+    dx, dy = (x0 - x1) / 2, (y0 - y1) / 2
+    x0p, y0p = cos * dx + sin * dy, -sin * dx + cos * dy
+    scale = (x0p / rx) ** 2 + (y0p / ry) ** 2
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    num = rx * rx * ry * ry - rx * rx * y0p * y0p - ry * ry * x0p * x0p
+    k = math.sqrt(max(0.0, num / (rx * rx * y0p * y0p + ry * ry * x0p * x0p)))
+    if large == sweep:
+        k = -k
+    cxp, cyp = k * rx * y0p / ry, -k * ry * x0p / rx
+    cx, cy = cos * cxp - sin * cyp + (x0 + x1) / 2, sin * cxp + cos * cyp + (y0 + y1) / 2
+    start = math.atan2((y0p - cyp) / ry, (x0p - cxp) / rx)
+    delta = math.atan2((-y0p - cyp) / ry, (-x0p - cxp) / rx) - start
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    segments = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / segments
+    t = 4 / 3 * math.tan(step / 4)
+
+    def point(a):
+        ex, ey = rx * math.cos(a), ry * math.sin(a)
+        return cx + cos * ex - sin * ey, cy + sin * ex + cos * ey
+
+    def tangent(a):
+        ex, ey = -rx * math.sin(a), ry * math.cos(a)
+        return cos * ex - sin * ey, sin * ex + cos * ey
+
+    a = start
+    for _ in range(segments):
+        b = a + step
+        (ax, ay), (bx, by) = point(a), point(b)
+        (tax, tay), (tbx, tby) = tangent(a), tangent(b)
+        path.cubicTo(ax + t * tax, ay + t * tay, bx - t * tbx, by - t * tby, bx, by)
+        a = b
@@ -0,0 +1,250 @@
+import functools
+import numpy as np
+
+# Below this weight a dot's influence on the ones behind it is far under a pixel
+SCAN_EPS = 1e-12
+# follow_speed and lag_speed are the fraction of the gap closed per physics step, one step per REFERENCE_DT
+REFERENCE_DT = 1 / 60
+SETTLE_EPS = 0.25       # px; closer than this to the target counts as caught up
+MAX_DT = 0.1            # s; a stalled tick is integrated as at most this much time
+
+
+def bounds(pos, chunks=8):
+    # (x0, y0, x1, y1) rows covering up to `chunks` contiguous runs of dots; a few boxes hug a curved trail far tighter than one
+    n = len(pos)
+    if not n:
+        return np.empty((0, 4))
+    starts = np.linspace(0, n, min(chunks, n), endpoint=False).astype(np.intp)
+    return np.hstack((np.minimum.reduceat(pos, starts), np.maximum.reduceat(pos, starts)))
+
+
+class Trail:
+    # Dot positions live in one contiguous (n, 2) float64 array, dot 0 leads
+    def __init__(self, count, x=0.0, y=0.0):
+        self.pos = np.empty((count, 2))
+        self.pos[:] = (x, y)
+        self.prev = self.pos.copy()
+        self.view = self.pos.copy()
+        self.carry = 0.0
+
+    def __len__(self):
+        return len(self.pos)
+
+    def resize(self, count, x=0.0, y=0.0):
+        # Keep the existing dots; new ones start on the current tail so the trail grows from its end
+        if count == len(self.pos):
+            return
+        self.pos, self.prev, self.view = (self._resized(a, count, x, y) for a in (self.pos, self.prev, self.view))
+
+    @staticmethod
+    def _resized(a, count, x, y):
+        if count < len(a):
+            return a[:count].copy()
+        out = np.empty((count,) + a.shape[1:])
+        out[:len(a)] = a
+        out[len(a):] = a[-1] if len(a) else (x, y)
+        return out
+
+    def bounds(self, chunks=8):
+        return bounds(self.view, chunks)
+
+    def settled(self, target_x, target_y, eps):
+        # True once every dot, and so every drawn position, is within eps of the target on both axes
+        if not len(self.pos):
+            return True
+        target = (target_x, target_y)
+        return float(max(np.abs(self.pos - target).max(), np.abs(self.prev - target).max())) < eps
+
+    def advance(self, target_x, target_y, follow, lag, dt):
+        # Physics runs in fixed REFERENCE_DT steps and leftover time carries over, so the trail moves the same
+        # at any tick rate; view blends the last two steps by the leftover and is what gets drawn
+        self.carry += dt
+        while self.carry >= REFERENCE_DT:
+            self.prev[:] = self.pos
+            self.step(target_x, target_y, follow, lag)
+            self.carry -= REFERENCE_DT
+        np.subtract(self.pos, self.prev, out=self.view)
+        self.view *= self.carry / REFERENCE_DT
+        self.view += self.prev
+        return self.view
+
+    def step(self, target_x, target_y, follow, lag):
+        p = self.pos
+        if not len(p):
+            return
+        # Indexed as p[0, ..., axis] so a TrailGroup, with a slot axis in the middle, steps through the same code
+        p[0, ..., 0] += (target_x - p[0, ..., 0]) * follow
+        p[0, ..., 1] += (target_y - p[0, ..., 1]) * follow
+        if len(p) < 2:
+            return
+        # Each dot chases the already-moved dot ahead of it: new[i] = lag * new[i-1] + (1 - lag) * old[i].
+        # That recurrence is solved for the whole trail at once with a log-step prefix scan.
+        rest = p[1:] * (1.0 - lag)
+        rest[0] += lag * p[0]
+        scale, d = lag, 1
+        while d < len(rest) and scale > SCAN_EPS:
+            rest[d:] += scale * rest[:-d]
+            scale *= scale
+            d *= 2
+        p[1:] = rest
+
+
+class TrailGroup(Trail):
+    # Many chase trails stepped as one: pos is (dots, trails, 2) and the targets are a per-trail array, so Trail's lead
+    # update and prefix scan move every trail in the same numpy calls. The arrays hold only the live trails, so a
+    # step costs nothing for trails that aren't there.
+    def __init__(self, count, trails=0):
+        super().__init__(0)
+        self.pos = np.zeros((count, trails, 2))
+        self.prev = self.pos.copy()
+        self.view = self.pos.copy()
+        self.target = np.zeros((trails, 2))
+
+    @property
+    def trails(self):
+        return self.pos.shape[1]
+
+    def regroup(self, keep, add):
+        # Keeps the trails at indices keep, in that order, and appends one gathered on each (x, y) in add, e.g. where
+        # a new pointer appeared
+        keep = np.asarray(keep, np.intp)
+        add = np.asarray(add, float).reshape(-1, 2)
+        for name in ("pos", "prev", "view"):
+            a = getattr(self, name)
+            setattr(self, name, np.concatenate((a[:, keep], np.broadcast_to(add, (len(a),) + add.shape)), axis=1))
+        self.target = np.concatenate((self.target[keep], add))
+
+    def advance_all(self, follow, lag, dt):
+        if not self.trails:
+            return self.view
+        return self.advance(self.target[:, 0], self.target[:, 1], follow, lag, dt)
+
+    def all_settled(self, eps):
+        if not len(self.pos) or not self.trails:
+            return True
+        return float(max(np.abs(self.pos - self.target).max(), np.abs(self.prev - self.target).max())) < eps
+
+    def trail_bounds(self):
+        # One (x0, y0, x1, y1) row per trail
+        v = self.view
+        return np.hstack((v.min(0), v.max(0))) if len(v) and self.trails else np.empty((0, 4))
+
+
+SPLINE_SECONDS = 0.3    # s of cursor history the spline trail stretches over
+HISTORY_SAMPLES = 512   # ring capacity; covers SPLINE_SECONDS up to ~1700 Hz sampling
+SPLINE_STEPS = 8        # polyline points per spline segment when measuring arc length
+
+
+def make_trail(mode, count, x=0.0, y=0.0):
+    return (SplineTrail if mode == "Spline" else Trail)(count, x, y)
+
+
+class History:
+    # Fixed-size ring of (t, x, y) cursor samples. Every sample is written twice, at i and i + capacity, so the
+    # newest k samples are always one contiguous, oldest-first slice and no wrap-around copy is needed.
+    def __init__(self, capacity=HISTORY_SAMPLES):
+        self.capacity = capacity
+        self.samples = np.zeros((2 * capacity, 3))
+        self.head = -1
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head = -1
+        self.count = 0
+
+    def push(self, t, x, y):
+        self.head = (self.head + 1) % self.capacity
+        self.samples[self.head] = self.samples[self.head + self.capacity] = (t, x, y)
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest(self, k):
+        # The newest k samples, oldest first, as a view
+        k = min(k, self.count)
+        end = self.head + self.capacity + 1
+        return self.samples[end - k:end]
+
+    def since(self, t):
+        # Samples newer than t, plus the last one at or before it so the cut can be interpolated
+        recent = self.latest(self.count)
+        return recent[max(0, int(np.searchsorted(recent[:, 0], t, side="right")) - 1):]
+
+
+def catmull_rom(points, steps=SPLINE_STEPS):
+    # Dense polyline through the (k, d) points along a uniform Catmull-Rom spline; the ends are extended by
+    # mirroring so the curve starts and stops exactly on the first and last point
+    if len(points) < 2:
+        return points.copy()
+    k, d = points.shape
+    p = np.vstack((2 * points[0] - points[1], points, 2 * points[-1] - points[-2]))
+    # Row j of the window matrix holds control points j .. j+3 side by side, as a strided view
+    windows = np.lib.stride_tricks.as_strided(p, (k - 1, 4 * d), (p.strides[0], p.strides[1]))
+    curve = (windows.reshape(k - 1, 4, d).transpose(0, 2, 1) @ spline_basis(steps).T).transpose(0, 2, 1)
+    return np.vstack((curve.reshape(-1, d), points[-1:]))
+
+
+@functools.lru_cache(maxsize=None)
+def spline_basis(steps):
+    # (steps, 4) Catmull-Rom weights of the four control points at each sub-step
+    u = np.linspace(0.0, 1.0, steps, endpoint=False)[:, None]
+    return np.hstack((-u + 2 * u ** 2 - u ** 3, 2 - 5 * u ** 2 + 3 * u ** 3, u + 4 * u ** 2 - 3 * u ** 3, -u ** 2 + u ** 3)) / 2
+
+
+class SplineTrail:
+    # Dots placed at even arc-length spacing along a Catmull-Rom spline through the last SPLINE_SECONDS of cursor
+    # samples, so fast moves give a continuous trail without more dots. Same interface as Trail; follow and lag
+    # don't apply, the trail's length is set by how far the cursor went in SPLINE_SECONDS.
+    def __init__(self, count, x=0.0, y=0.0):
+        self.history = History()
+        self.t = 0.0
+        self.view = np.empty((count, 2))
+        self.view[:] = (x, y)
+        self.pos = self.view
+
+    def __len__(self):
+        return len(self.view)
+
+    def resize(self, count, x=0.0, y=0.0):
+        if count == len(self.view):
+            return
+        self.view = Trail._resized(self.view, count, x, y)
+        self.pos = self.view
+        self._place()
+
+    def bounds(self, chunks=8):
+        return bounds(self.view, chunks)
+
+    def settled(self, target_x, target_y, eps):
+        if not len(self.view):
+            return True
+        return float(np.abs(self.view - (target_x, target_y)).max()) < eps
+
+    def advance(self, target_x, target_y, follow, lag, dt):
+        self.t += dt
+        self.history.push(self.t, target_x, target_y)
+        self._place()
+        return self.view
+
+    def _place(self):
+        n = len(self.view)
+        samples = self.history.since(self.t - SPLINE_SECONDS)
+        if not n or not len(samples):
+            return
+        # Repeated positions (a still cursor) would make zero-length segments; keep the newest of each run
+        keep = np.ones(len(samples), bool)
+        keep[:-1] = np.any(samples[1:, 1:] != samples[:-1, 1:], axis=1)
+        samples = samples[keep]
+        if len(samples) < 2:
+            self.view[:] = samples[-1, 1:]
+            return
+        # Time is splined along with x and y, so the cut at SPLINE_SECONDS ago can be found on the curve
+        curve = catmull_rom(samples)
+        s = np.zeros(len(curve))
+        np.cumsum(np.hypot(*np.diff(curve[:, 1:], axis=0).T), out=s[1:])
+        t = np.maximum.accumulate(curve[:, 0])
+        tail = np.interp(self.t - SPLINE_SECONDS, t, s)
+        at = s[-1] - np.linspace(0.0, 1.0, n) * (s[-1] - tail)
+        self.view[:, 0] = np.interp(at, s, curve[:, 1])
+        self.view[:, 1] = np.interp(at, s, curve[:, 2])
@@ -0,0 +1,96 @@
+import threading, time
+import numpy as np
+from trail import MAX_DT, SETTLE_EPS
+
+DEFAULT_SAMPLE_HZ = 240
+
+
+class SnapshotBuffer:
+    # Lock-free hand-off of dot positions from one writer thread to one reader thread. The writer fills a spare slot and
+    # publishes it with a single reference store; the reader pins the slot it takes and the writer never refills the
+    # published or the pinned slot. That is a double buffer plus one spare, so neither side ever waits on the other.
+    def __init__(self, count=0):
+        self._allocate(count)
+        self.front = self.slots[0]
+        self.pinned = None
+        self.seq = 0
+
+    def _allocate(self, count):
+        # Readers holding an old slot keep it alive; it is simply never written again
+        self.slots = [np.zeros((count, 2)) for _ in range(3)]
+
+    def publish(self, pos):
+        if len(pos) != len(self.slots[0]):
+            self._allocate(len(pos))
+        front, pinned = self.front, self.pinned
+        back = next(s for s in self.slots if s is not front and s is not pinned)
+        back[:] = pos
+        self.front = back
+        self.seq += 1
+
+    def read(self):
+        # Pin, then confirm the pin still names the published slot; if the writer moved on in between, take the newer one
+        while True:
+            snap = self.front
+            self.pinned = snap
+            if self.front is snap:
+                return snap
+
+
+class TrailWorker(threading.Thread):
+    # Samples the cursor and steps the trail off the GUI thread; the GUI only reads published snapshots.
+    # settings is swapped whole by the GUI thread, never mutated, so reading the reference is always consistent.
+    def __init__(self, trail, cursor, settings, hz=DEFAULT_SAMPLE_HZ, idle_poll=0.1, on_wake=None, clock=time.perf_counter):
+        super().__init__(name="trail-worker", daemon=True)
+        self.trail = trail
+        self.cursor = cursor
+        self.settings = settings
+        self.period = 1 / hz
+        self.idle_poll = idle_poll
+        self.on_wake = on_wake
+        self.clock = clock
+        self.snapshots = SnapshotBuffer(len(trail))
+        self.snapshots.publish(trail.view)
+        self.idle = False
+        self.step_time = (0.0, 0.0)     # seconds spent reading the cursor and stepping physics last sample
+        self._halt = threading.Event()
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+    def run(self):
+        last_cursor, last = None, self.clock()
+        next_at = last
+        while not self._halt.is_set():
+            t0 = time.perf_counter()
+            x, y = self.cursor.pos()
+            t1 = time.perf_counter()
+            if (x, y) != last_cursor:
+                last_cursor = (x, y)
+                if self.idle:
+                    self.idle = False
+                    last = self.clock() - self.period
+                    if self.on_wake:
+                        self.on_wake()
+            if self.idle:
+                self._halt.wait(self.idle_poll)
+                continue
+            now = self.clock()
+            dt, last = min(now - last, MAX_DT), now
+            s = self.settings
+            if len(self.trail) != s.num_dots:
+                self.trail.resize(s.num_dots, x, y)
+            self.trail.advance(x, y, s.follow_speed, s.lag_speed, dt)
+            self.snapshots.publish(self.trail.view)
+            self.step_time = (t1 - t0, time.perf_counter() - t1)
+            if self.trail.settled(x, y, SETTLE_EPS):
+                self.idle = True
+                continue
+            # Fixed-rate schedule; after a stall, restart from now rather than bursting to catch up
+            next_at += self.period
+            delay = next_at - self.clock()
+            if delay > 0:
+                self._halt.wait(delay)
+            else:
+                next_at = self.clock()